@@ -0,0 +1,101 @@
+# core/asyncviews.py
+"""
+Async read path for the list and detail endpoints.
+
+DRF views are synchronous, so under an ASGI server every request to them
+runs in the one thread asgiref keeps for sync code, and a slow query holds
+up the rest. AsyncReadMixin.as_async_view() serves a view's GET and HEAD
+requests from a coroutine instead: authentication and permission checks
+still run in a thread (they are DRF's), but the conditional GET validators,
+the response cache, pagination and the compiled serializer read through the
+async ORM and cache APIs. Other methods go to the sync view as before.
+
+With settings.ASYNC_READ_VIEWS on, read_view() routes the endpoints this
+way; turn it on when serving csesa_backend.asgi, and leave it off under
+WSGI, where each async view would need an event loop of its own.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.response import Response
+
+
+def read_view(view_class, **initkwargs):
+    """The URL pattern view for `view_class`: async reads with ASYNC_READ_VIEWS on."""
+    if settings.ASYNC_READ_VIEWS:
+        return view_class.as_async_view(**initkwargs)
+    return view_class.as_view(**initkwargs)
+
+
+class AsyncReadMixin:
+    """
+    Async GET for a generic list or detail view. Must come right before the
+    DRF generic view class, after the mixins whose aget()/alist() it ends.
+    """
+
+    @classmethod
+    def as_async_view(cls, **initkwargs):
+        sync_view = cls.as_view(**initkwargs)
+
+        async def view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.async_dispatch(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        return csrf_exempt(view)
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        """APIView.dispatch() for GET."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authentication and permission checks may query the database.
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await self.aget(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aget(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            return await self.aretrieve(request, *args, **kwargs)
+        return await self.alist(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        # Reached when the serializer doesn't compile, e.g. for normalized
+        # responses: DRF's own list() does the work in a thread.
+        return await sync_to_async(super().list)(request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+    async def aget_object(self):
+        """GenericAPIView.get_object() through the async ORM."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            # The queryset's prefetches are made by the same call.
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
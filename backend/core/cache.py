@@ -0,0 +1,158 @@
+# core/cache.py
+"""
+Response cache for the read-mostly list endpoints.
+
+Every model has a generation counter in the cache that the signal handlers in
+core/signals.py bump whenever one of its rows changes. Cached responses are
+keyed by the generations of every model they were built from, so a write
+makes the affected keys unreachable at once and nothing depends on a TTL.
+That takes a cache every worker process shares; settings.py refuses to run
+several workers on the per-process locmem cache.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+GENERATION_KEY = 'generation:{}'
+HITS_KEY = 'response-cache:hits'
+MISSES_KEY = 'response-cache:misses'
+
+
+def _generation_key(model):
+    return GENERATION_KEY.format(model._meta.label_lower)
+
+
+def get_generations(models):
+    """Return the current generation of each model, in order."""
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # Start from a unique value so a counter that was evicted can
+            # never come back with a number an older response was keyed on.
+            cache.add(key, time.time_ns(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+async def aget_generations(models):
+    """get_generations() for async views."""
+    keys = [_generation_key(model) for model in models]
+    generations = await cache.aget_many(keys)
+    for key in keys:
+        if key not in generations:
+            await cache.aadd(key, time.time_ns(), timeout=None)
+            generations[key] = await cache.aget(key)
+    return [generations[key] for key in keys]
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_generation(model):
+    """
+    Invalidate every cached response built from `model`. Inside a transaction
+    the counter is bumped again on commit, so a response cached from a read
+    that raced the write can't outlive it.
+    """
+    key = _generation_key(model)
+    _incr(key)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _incr(key))
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+async def _acount(key):
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, timeout=None)
+        await cache.aincr(key)
+
+
+def get_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else None,
+    }
+
+
+def reset_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+class CachedListMixin:
+    """
+    Serve a list view's GET responses from the cache.
+
+    `response_models` lists every model whose rows appear in the response,
+    including the ones reached through nested serializers.
+    """
+    response_models = ()
+
+    def get_cache_key(self, request):
+        return self.make_cache_key(request, get_generations(self.response_models))
+
+    async def aget_cache_key(self, request):
+        return self.make_cache_key(request, await aget_generations(self.response_models))
+
+    def make_cache_key(self, request, generations):
+        # The responses hold absolute URLs (pictures, srcsets), so the scheme
+        # and host are part of the key along with the path.
+        path = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        return 'response:{}.{}:{}:{}'.format(
+            type(self).__module__, type(self).__name__, path,
+            '.'.join(str(generation) for generation in generations),
+        )
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            _count(HITS_KEY)
+            response = Response(data)
+        else:
+            _count(MISSES_KEY)
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        # core.middleware.CompressionMiddleware caches the compressed body
+        # under the same key.
+        response.compression_cache_key = key
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        key = await self.aget_cache_key(request)
+        data = await cache.aget(key)
+        if data is not None:
+            await _acount(HITS_KEY)
+            response = Response(data)
+        else:
+            await _acount(MISSES_KEY)
+            response = await super().alist(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            await cache.aset(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response.compression_cache_key = key
+        return response
@@ -0,0 +1,330 @@
+# core/compiled.py
+"""
+Compiled read path for the list views.
+
+A ModelSerializer builds a model instance per row, then walks its fields
+calling get_attribute() and to_representation() on each, and instantiates
+nothing less for every nested row. For a list page that is most of the CPU
+once the queries are tuned.
+
+compile_serializer() flattens a serializer into the `.values()` columns it
+reads and one small render function per field, once per serializer class
+and field selection. Nested foreign keys are read from the same row through
+joins; nested many-relations with one `.values()` query each, like
+prefetch_related(). The output is the same data the serializer would
+produce, in the same order; serializers with fields it can't reproduce are
+left to DRF.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F
+from rest_framework import fields as drf_fields
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .images import srcset
+from .serializers import SrcsetField
+from .sparse import ALL, get_model_field, nested_serializer
+from .timing import measure
+
+PARENT = '_compiled_parent'
+SKIP = object()
+
+# Stock DRF fields whose to_representation() only looks at the value.
+UNCOMPILABLE_FIELDS = (drf_fields.SerializerMethodField, drf_fields.ModelField, drf_fields.HiddenField)
+
+# Compiled serializers kept per process; every distinct ?fields= makes one.
+COMPILED_CACHE_SIZE = 256
+
+
+class NotCompilable(Exception):
+    pass
+
+
+def compile_serializer(serializer_class, selection=ALL):
+    """
+    Return the CompiledSerializer for `serializer_class` rendering
+    `selection`, or None when it has to go through DRF.
+    """
+    # Fields render in the serializer's order whatever order they were
+    # selected in, so `id,name` and `name,id` share an entry.
+    return _compile(serializer_class, _freeze(selection))
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(serializer_class, frozen_selection):
+    serializer = serializer_class(context={'selection': _thaw(frozen_selection)})
+    try:
+        return CompiledSerializer(serializer, serializer_class.Meta.model)
+    except NotCompilable:
+        return None
+
+
+def _freeze(selection):
+    """A hashable, canonical form of a selection."""
+    if selection is ALL:
+        return ALL
+    return tuple(sorted((name, _freeze(child)) for name, child in selection.items()))
+
+
+def _thaw(frozen_selection):
+    if frozen_selection is ALL:
+        return ALL
+    return {name: _thaw(child) for name, child in frozen_selection}
+
+
+class CompiledSerializer:
+    """
+    A serializer flattened into `.values()` columns and per-field render
+    functions. `prefix` is the lookup path from the root model for
+    serializers nested through foreign keys, which share the root's rows.
+    """
+
+    def __init__(self, serializer, model, prefix=''):
+        if type(serializer).to_representation is not serializers.Serializer.to_representation \
+                and not hasattr(serializer, 'finalize_representation'):
+            raise NotCompilable
+
+        self.model = model
+        self.prefix = prefix
+        self.pk_column = prefix + model._meta.pk.name
+        self.columns = {self.pk_column: None}
+        self.fields = []
+        self.relations = []
+        self.children = []
+
+        # Model fields to_representation() reads besides the serializer fields.
+        self.required = [
+            name for names in getattr(serializer, 'sparse_requires', {}).values() for name in names
+        ]
+        self.columns.update(dict.fromkeys(prefix + name for name in self.required))
+        self.finalize = getattr(serializer, 'finalize_representation', None)
+
+        for name, field in serializer.fields.items():
+            if not field.write_only:
+                self.fields.append((name, self.compile_field(field)))
+
+    def compile_field(self, field):
+        if field.source == '*':
+            raise NotCompilable
+
+        model, path, guards = self.model, self.prefix, []
+        *hops, attr = field.source.split('.')
+        try:
+            for hop in hops:
+                hop_field = get_model_field(model, hop)
+                if not (hop_field.many_to_one or hop_field.one_to_one) or not hop_field.concrete:
+                    raise NotCompilable
+                # DRF skips a dotted field when a link in its source is None.
+                guards.append(path + hop)
+                model, path = hop_field.related_model, f'{path}{hop}__'
+            model_field = get_model_field(model, attr)
+        except FieldDoesNotExist:
+            raise NotCompilable
+        self.columns.update(dict.fromkeys(guards))
+
+        nested = nested_serializer(field)
+        column = path + attr
+        if model_field.many_to_many or model_field.one_to_many:
+            if nested is None or hops:
+                raise NotCompilable
+            if model_field.concrete:
+                lookup = model_field.related_query_name()
+            else:
+                lookup = model_field.field.name
+            relation = (lookup, CompiledSerializer(nested, model_field.related_model))
+            self.relations.append(relation)
+            pk_column = self.pk_column
+
+            def render(row, context, related):
+                return related[relation].get(row[pk_column], [])
+        elif nested is not None:
+            if not model_field.is_relation:
+                raise NotCompilable
+            child = CompiledSerializer(nested, model_field.related_model, prefix=f'{column}__')
+            self.children.append(child)
+            self.columns[column] = None
+            self.columns.update(child.columns)
+
+            def render(row, context, related):
+                return None if row[column] is None else child.render_row(row, context, related)
+        else:
+            convert = converter(field, model_field)
+            self.columns[column] = None
+
+            def render(row, context, related):
+                value = row[column]
+                return None if value is None else convert(value, context)
+
+        if not guards:
+            return render
+
+        def guarded(row, context, related):
+            if any(row[guard] is None for guard in guards):
+                return SKIP
+            return render(row, context, related)
+        return guarded
+
+    def values(self, queryset):
+        """The root queryset's rows, as the dicts render() takes."""
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        columns = dict(self.columns)
+        columns.update(dict.fromkeys(
+            field.lstrip('-') for field in ordering if isinstance(field, str) and '__' not in field
+        ))
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    def render(self, rows, context):
+        related = {}
+        self.load(rows, context, related)
+        return [self.render_row(row, context, related) for row in rows]
+
+    async def arender(self, rows, context):
+        """render() for async views."""
+        related = {}
+        await self.aload(rows, context, related)
+        return [self.render_row(row, context, related) for row in rows]
+
+    def load(self, rows, context, related):
+        """Fetch and render the many-relations of `rows`, grouped by parent."""
+        for relation in self.relations:
+            queryset = self.relation_queryset(relation, rows)
+            child_rows = list(queryset) if queryset is not None else []
+            self.group(relation, child_rows, relation[1].render(child_rows, context), related)
+        for child in self.children:
+            child.load(rows, context, related)
+
+    async def aload(self, rows, context, related):
+        for relation in self.relations:
+            queryset = self.relation_queryset(relation, rows)
+            child_rows = [row async for row in queryset] if queryset is not None else []
+            self.group(relation, child_rows, await relation[1].arender(child_rows, context), related)
+        for child in self.children:
+            await child.aload(rows, context, related)
+
+    def relation_queryset(self, relation, rows):
+        """The child rows of a many-relation of `rows`, or None when there are none."""
+        lookup, child = relation
+        keys = {row[self.pk_column] for row in rows if row[self.pk_column] is not None}
+        if not keys:
+            return None
+        return (
+            child.model._default_manager.filter(**{f'{lookup}__in': keys})
+            .values(*child.columns, **{PARENT: F(lookup)})
+        )
+
+    def group(self, relation, child_rows, rendered, related):
+        grouped = related[relation] = {}
+        for child_row, data in zip(child_rows, rendered):
+            grouped.setdefault(child_row[PARENT], []).append(data)
+
+    def render_row(self, row, context, related):
+        data = {}
+        for name, render in self.fields:
+            value = render(row, context, related)
+            if value is not SKIP:
+                data[name] = value
+        if self.finalize is not None:
+            data = self.finalize(data, {name: row[self.prefix + name] for name in self.required}, context)
+        return data
+
+
+def _identity(value, context):
+    return value
+
+
+def _str(value, context):
+    return str(value)
+
+
+def _int(value, context):
+    return int(value)
+
+
+def converter(field, model_field):
+    """Return a function (raw column value, context) -> representation."""
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            raise NotCompilable
+        return _identity
+    if isinstance(field, serializers.RelatedField):
+        raise NotCompilable
+
+    if isinstance(field, serializers.FileField):
+        if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            return lambda value, context: value or None
+        storage = model_field.storage
+
+        def file_url(value, context):
+            if not value:
+                return None
+            url = storage.url(value)
+            request = context.get('request')
+            return request.build_absolute_uri(url) if request is not None else url
+        return file_url
+
+    if isinstance(field, SrcsetField):
+        def srcset_urls(value, context):
+            request = context.get('request')
+            return srcset(value, request.build_absolute_uri if request is not None else str)
+        return srcset_urls
+
+    if type(field) in (serializers.CharField, serializers.EmailField, serializers.URLField):
+        return _str
+    if type(field) is serializers.IntegerField:
+        return _int
+    if type(field) is serializers.JSONField and not field.binary:
+        return _identity
+    if type(field).__module__ == drf_fields.__name__ and not isinstance(field, UNCOMPILABLE_FIELDS):
+        to_representation = field.to_representation
+        return lambda value, context: to_representation(value)
+    raise NotCompilable
+
+
+class CompiledListMixin:
+    """
+    Serve a list view's GET responses through compile_serializer() when the
+    serializer compiles, and through the serializer otherwise. Must come
+    after CachedListMixin and SideloadViewMixin.
+    """
+    use_compiled_serializer = True
+
+    def get_compiled_serializer(self):
+        if not self.use_compiled_serializer:
+            return None
+        context = self.get_serializer_context()
+        if context.get('included') is not None:
+            return None
+        return compile_serializer(self.get_serializer_class(), context.get('selection', ALL))
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = compiled.values(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        with measure('serialize'):
+            data = compiled.render(rows, context)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    async def alist(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return await super().alist(request, *args, **kwargs)
+
+        queryset = compiled.values(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        page = await self.apaginate_queryset(queryset)
+        rows = page if page is not None else [row async for row in queryset]
+        with measure('serialize'):
+            data = await compiled.arender(rows, context)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
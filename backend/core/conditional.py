@@ -0,0 +1,124 @@
+# core/conditional.py
+"""
+Conditional GET support (ETag / Last-Modified) for the API views.
+
+The validators come from one aggregate query, MAX(updated_at) and COUNT(*)
+over the rows the view would return, plus the core.cache generation counters
+of the other models nested in the response. When the client already has the
+current version the view answers 304 without serializing anything.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache import aget_generations, get_generations
+
+
+def has_updated_at(model):
+    return any(field.name == 'updated_at' for field in model._meta.concrete_fields)
+
+
+class ConditionalGetMixin:
+    """
+    Add ETag/Last-Modified validation to a generic list or detail view.
+
+    `response_models` lists every model whose rows appear in the response;
+    the view's own model is tracked through its updated_at column when it has
+    one, the rest through their generation counters.
+    """
+    response_models = ()
+
+    def get_cache_control(self):
+        """Cache-Control directives for successful and 304 responses."""
+        # Let clients keep the body but revalidate it on every use.
+        return {'private': True, 'no_cache': True}
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_validator_query(self):
+        """
+        Return (queryset, aggregates, generation_models): the aggregates to
+        compute over the rows and the models tracked by generation instead.
+        """
+        queryset = self.get_conditional_queryset()
+        model = queryset.model
+        tracked_by_column = has_updated_at(model)
+
+        aggregates = {'count': Count('pk')}
+        if tracked_by_column:
+            aggregates['last_modified'] = Max('updated_at')
+        generation_models = [m for m in self.response_models if not (m is model and tracked_by_column)]
+        return queryset.order_by(), aggregates, generation_models
+
+    def get_validators(self, request):
+        """
+        Return (etag, last_modified, last_modified_timestamp, count), where the
+        timestamp is None when If-Modified-Since can't be honoured.
+        """
+        queryset, aggregates, generation_models = self.get_validator_query()
+        values = queryset.aggregate(**aggregates)
+        return self.make_validators(request, values, get_generations(generation_models), generation_models)
+
+    async def aget_validators(self, request):
+        queryset, aggregates, generation_models = self.get_validator_query()
+        values = await queryset.aaggregate(**aggregates)
+        return self.make_validators(request, values, await aget_generations(generation_models), generation_models)
+
+    def make_validators(self, request, values, generations, generation_models):
+        last_modified = values.get('last_modified')
+        fingerprint = ':'.join(str(part) for part in [
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            last_modified.isoformat() if last_modified else '',
+            values['count'],
+            *generations,
+        ])
+        etag = '"{}"'.format(hashlib.md5(fingerprint.encode()).hexdigest())
+        # If-Modified-Since alone can only be trusted when nothing but the
+        # view's own rows, which carry updated_at, appear in the response.
+        if generation_models:
+            last_modified_timestamp = None
+        else:
+            last_modified_timestamp = last_modified.timestamp() if last_modified else None
+        return etag, last_modified, last_modified_timestamp, values['count']
+
+    def get_not_modified_response(self, request, validators):
+        etag, last_modified, last_modified_timestamp, count = validators
+        if not count:
+            return None
+        return get_conditional_response(request, etag=etag, last_modified=last_modified_timestamp)
+
+    def add_validator_headers(self, response, validators):
+        etag, last_modified, last_modified_timestamp, count = validators
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_cache_control(response, **self.get_cache_control())
+        # The representation depends on the negotiated renderer.
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators(request)
+        response = self.get_not_modified_response(request, validators)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return self.add_validator_headers(response, validators)
+
+    async def aget(self, request, *args, **kwargs):
+        validators = await self.aget_validators(request)
+        response = self.get_not_modified_response(request, validators)
+        if response is None:
+            response = await super().aget(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return self.add_validator_headers(response, validators)
@@ -0,0 +1,91 @@
+# core/db_router.py
+"""
+Read replica routing.
+
+Views with `read_from_replica = True` read from one of
+settings.DATABASE_REPLICAS on GET and HEAD, picked per request (see
+core.middleware.ReplicaRoutingMiddleware); everything else, and every write,
+uses the primary. Once a request writes, the rest of it reads from the
+primary too.
+
+Replicas lag behind the primary, and the response cache and ETags are keyed
+on generation counters that a write bumps at once: a replica read just after
+any write could be cached as current. So for DATABASE_REPLICA_LAG seconds
+after a write, from any user or process, all reads go to the primary. The
+marker lives in the cache, which must be shared between workers for it to
+work across them.
+"""
+import contextvars
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+PINNED_KEY = 'replica:pinned'
+
+_state = contextvars.ContextVar('replica_routing', default=None)
+
+
+class RoutingState:
+    """Routing for the current request: the replica it reads from, if any."""
+
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+
+
+def start_request():
+    """Start routing a request; returns the token end_request() needs."""
+    return _state.set(RoutingState())
+
+
+def end_request(token):
+    state = _state.get()
+    if state is not None and state.wrote:
+        # Restart the window now the request's writes have committed.
+        pin_to_primary()
+    _state.reset(token)
+
+
+def use_replica():
+    """Send the current request's reads to a replica, unless pinned to the primary."""
+    state = _state.get()
+    if state is None or not settings.DATABASE_REPLICAS or state.wrote or is_pinned():
+        return
+    state.replica = random.choice(settings.DATABASE_REPLICAS)
+
+
+def pin_to_primary():
+    cache.set(PINNED_KEY, True, timeout=settings.DATABASE_REPLICA_LAG)
+
+
+def is_pinned():
+    return cache.get(PINNED_KEY, False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.replica is not None and not state.wrote:
+            return state.replica
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is None:
+            # Outside a request, e.g. a management command.
+            if settings.DATABASE_REPLICAS:
+                pin_to_primary()
+        elif not state.wrote:
+            state.wrote = True
+            if settings.DATABASE_REPLICAS:
+                pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,71 @@
+# core/filters.py
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+
+def _query_values(request, param):
+    raw = request.query_params.get(param, '')
+    return list(dict.fromkeys(value.strip() for value in raw.split(',') if value.strip()))
+
+
+class JSONListFilter(BaseFilterBackend):
+    """
+    Filter JSON list columns by their elements, e.g. `?tags=ai,web`.
+
+    Views declare `json_list_filters = {'<query param>': '<field>'}`. Rows
+    match when they contain any of the values, or all of them with
+    `?match=all`. On PostgreSQL this is jsonb `?|` / `@>`, served by the GIN
+    indexes on these columns; other databases fall back to json_each().
+    """
+    match_query_param = 'match'
+
+    def filter_queryset(self, request, queryset, view):
+        match_all = request.query_params.get(self.match_query_param) == 'all'
+        for param, field in getattr(view, 'json_list_filters', {}).items():
+            values = _query_values(request, param)
+            if values:
+                queryset = self.filter_field(queryset, field, values, match_all)
+        return queryset
+
+    def filter_field(self, queryset, field, values, match_all):
+        if connection.vendor == 'postgresql':
+            if match_all:
+                return queryset.filter(**{f'{field}__contains': values})
+            return queryset.filter(**{f'{field}__has_any_keys': values})
+
+        column = '{}.{}'.format(
+            connection.ops.quote_name(queryset.model._meta.db_table),
+            connection.ops.quote_name(queryset.model._meta.get_field(field).column),
+        )
+        placeholders = ', '.join(['%s'] * len(values))
+        if match_all:
+            sql = (f'(SELECT COUNT(DISTINCT value) FROM json_each({column}) '
+                   f'WHERE value IN ({placeholders})) = {len(values)}')
+        else:
+            sql = f'EXISTS (SELECT 1 FROM json_each({column}) WHERE value IN ({placeholders}))'
+        alias = f'_{field}_match'
+        return queryset.alias(**{alias: RawSQL(sql, values, output_field=BooleanField())}).filter(**{alias: True})
+
+
+def json_list_facets(queryset, field):
+    """
+    Count how many rows of `queryset` contain each element of the JSON list
+    column `field`, most frequent first, in one aggregate query.
+    """
+    inner_sql, params = queryset.order_by().prefetch_related(None).values('pk', field).query.sql_with_params()
+    # values() aliases the selected columns by their names in the call.
+    pk = connection.ops.quote_name('pk')
+    column = connection.ops.quote_name(field)
+    if connection.vendor == 'postgresql':
+        elements = f'jsonb_array_elements_text(matched.{column}) AS element(value)'
+    else:
+        elements = f'json_each(matched.{column}) AS element'
+    sql = (
+        f'SELECT element.value, COUNT(DISTINCT matched.{pk}) AS rows FROM ({inner_sql}) AS matched, {elements} '
+        f'GROUP BY element.value ORDER BY rows DESC, element.value'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [{'value': value, 'count': count} for value, count in cursor.fetchall()]
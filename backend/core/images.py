@@ -0,0 +1,102 @@
+# core/images.py
+"""
+Resized WebP/JPEG variants of uploaded images.
+
+Each upload is decoded once, rotated upright, stripped of EXIF and saved at
+every width in IMAGE_VARIANT_WIDTHS that is narrower than the original (or at
+the original width when it is narrower than all of them). Variants are named
+after a hash of the original's bytes, so identical uploads share files and a
+variant URL never changes content, which makes them safe to cache forever.
+
+The model keeps a map of the generated names next to the image field:
+
+    {"source": "project_images/a.jpg",
+     "webp": {"160": "variants/3f2a...-160.webp", ...},
+     "jpeg": {"160": "variants/3f2a...-160.jpg", ...}}
+"""
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+VARIANTS_DIR = 'variants'
+FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+
+
+def generate_variants(field_file):
+    """Create the variants for `field_file` and return the variant map."""
+    field_file.open('rb')
+    try:
+        data = field_file.read()
+    finally:
+        field_file.close()
+
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    with Image.open(BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    widths = [width for width in settings.IMAGE_VARIANT_WIDTHS if width < image.width] or [image.width]
+    variants = {'source': field_file.name}
+    for key, (pil_format, extension) in FORMATS.items():
+        variants[key] = {}
+        for width in widths:
+            name = f'{VARIANTS_DIR}/{digest}-{width}.{extension}'
+            if not default_storage.exists(name):
+                default_storage.save(name, ContentFile(_encode(image, width, pil_format)))
+            variants[key][str(width)] = name
+    return variants
+
+
+def _encode(image, width, pil_format):
+    height = max(1, round(image.height * width / image.width))
+    resized = image.resize((width, height), Image.Resampling.LANCZOS)
+    if pil_format == 'JPEG' and resized.mode != 'RGB':
+        # JPEG has no alpha channel; flatten transparency onto white.
+        background = Image.new('RGB', resized.size, 'white')
+        rgba = resized.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        resized = background
+    elif pil_format == 'WEBP' and resized.mode not in ('RGB', 'RGBA'):
+        resized = resized.convert('RGBA' if 'A' in resized.getbands() else 'RGB')
+
+    # Only pixel data is written: no EXIF, ICC or other metadata is passed on.
+    buffer = BytesIO()
+    resized.save(buffer, pil_format, quality=settings.IMAGE_VARIANT_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def variants_are_current(field_file, variants):
+    if not field_file:
+        return not variants
+    return bool(variants) and variants.get('source') == field_file.name
+
+
+def srcset(variants, build_url):
+    """Turn a variant map into {"webp": "<url> 160w, ...", "jpeg": ...}."""
+    if not variants:
+        return None
+    return {
+        key: ', '.join(
+            f'{build_url(default_storage.url(name))} {width}w'
+            for width, name in sorted(variants.get(key, {}).items(), key=lambda item: int(item[0]))
+        )
+        for key in FORMATS
+    }
+
+
+def variant_for_width(variants, width, key='webp'):
+    """
+    Storage name of the smallest `key` variant at least `width` wide, or of
+    the largest one when none is; None without variants.
+    """
+    sized = sorted((int(w), name) for w, name in (variants or {}).get(key, {}).items())
+    if not sized:
+        return None
+    return next((name for w, name in sized if w >= width), sized[-1][1])
@@ -0,0 +1,205 @@
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.management.commands.benchmark_serializers import create_rows
+from events.models import Event
+from projects.models import Project
+from users.models import Domain, Role, User
+
+PATHS = ['/api/events/', '/api/projects/', '/api/users/list/', '/api/users/domains/', '/api/users/roles/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the read endpoints under the WSGI and ASGI deployments and report '
+        'throughput and p50/p99 latency per number of concurrent clients'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi', help='Base URL of a running WSGI deployment')
+        parser.add_argument('--asgi', help='Base URL of a running ASGI deployment (with ASYNC_READ_VIEWS on)')
+        parser.add_argument('--serve', action='store_true',
+                            help='Start gunicorn (sync workers) and uvicorn locally instead')
+        parser.add_argument('--workers', type=int, default=4, help='Worker processes per server with --serve')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000],
+                            help='Numbers of concurrent clients to test')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds per concurrency level')
+        parser.add_argument('--path', action='append', dest='paths', help=f'Paths to request (default: {PATHS})')
+        parser.add_argument('--rows', type=int, default=0,
+                            help='Create this many rows of each kind first and delete them afterwards')
+        parser.add_argument('--token', help='JWT access token to send (default: one for a created user)')
+
+    def handle(self, *args, **options):
+        if options['serve']:
+            targets = {'wsgi': 'http://127.0.0.1:8101', 'asgi': 'http://127.0.0.1:8102'}
+        else:
+            targets = {name: options[name] for name in ('wsgi', 'asgi') if options[name]}
+        if not targets:
+            raise CommandError('Pass --wsgi and/or --asgi URLs, or --serve')
+
+        # Every client holds a socket open.
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+        token = options['token']
+        servers = []
+        try:
+            if options['rows']:
+                create_rows(options['rows'])
+                token = token or str(AccessToken.for_user(User.objects.filter(username='benchmark-0').get()))
+            if options['serve']:
+                servers = self.serve(targets, options['workers'])
+
+            headers = {'Authorization': f'Bearer {token}'} if token else {}
+            self.stdout.write(f"{'deployment':>10} {'clients':>8} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+            for concurrency in options['concurrency']:
+                for name, url in targets.items():
+                    result = asyncio.run(load(url, options['paths'] or PATHS, headers, concurrency, options['duration']))
+                    self.stdout.write(
+                        f"{name:>10} {concurrency:>8} {result['throughput']:>9.0f} "
+                        f"{result['p50'] * 1000:>9.1f} {result['p99'] * 1000:>9.1f} {result['errors']:>7}"
+                    )
+        finally:
+            for server in servers:
+                server.terminate()
+                server.wait()
+            if options['rows']:
+                delete_rows()
+
+    def serve(self, targets, workers):
+        wsgi = urlsplit(targets['wsgi'])
+        asgi = urlsplit(targets['asgi'])
+        servers = [
+            subprocess.Popen([
+                sys.executable, '-m', 'gunicorn', 'csesa_backend.wsgi:application',
+                '--bind', wsgi.netloc, '--workers', str(workers), '--backlog', '2048', '--log-level', 'warning',
+            ], env={**os.environ, 'ASYNC_READ_VIEWS': 'False'}),
+            subprocess.Popen([
+                sys.executable, '-m', 'uvicorn', 'csesa_backend.asgi:application',
+                '--host', asgi.hostname, '--port', str(asgi.port), '--workers', str(workers),
+                '--backlog', '2048', '--log-level', 'warning', '--no-access-log',
+            ], env={**os.environ, 'ASYNC_READ_VIEWS': 'True'}),
+        ]
+        for url in (wsgi, asgi):
+            asyncio.run(wait_for_port(url.hostname, url.port))
+        return servers
+
+
+def delete_rows():
+    """Delete what create_rows() made."""
+    users = User.objects.filter(username__startswith='benchmark-')
+    Project.objects.filter(created_by__in=users).delete()
+    Event.objects.filter(created_by__in=users).delete()
+    users.delete()
+    Role.objects.filter(name__startswith='Benchmark role ').delete()
+    Domain.objects.filter(name__startswith='Benchmark domain ').delete()
+
+
+async def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise CommandError(f'Nothing is listening on {host}:{port}')
+            await asyncio.sleep(0.2)
+        else:
+            writer.close()
+            return
+
+
+async def load(url, paths, headers, concurrency, duration):
+    """Run `concurrency` keep-alive clients against `url` for `duration` seconds."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    header_lines = ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+    requests = [
+        f'GET {parts.path.rstrip("/")}{path} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+        f'Accept: application/json\r\n{header_lines}\r\n'.encode()
+        for path in paths
+    ]
+    latencies = []
+    errors = [0]
+    deadline = time.perf_counter() + duration
+
+    async def client(offset):
+        reader = writer = None
+        i = offset
+        while time.perf_counter() < deadline:
+            request = requests[i % len(requests)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                writer.write(request)
+                await writer.drain()
+                status, keep_alive = await read_response(reader)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors[0] += 1
+                writer = close(writer)
+                continue
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors[0] += 1
+            if not keep_alive:
+                writer = close(writer)
+        close(writer)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'throughput': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'errors': errors[0],
+    }
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; return (status, whether the connection stays open)."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    version, status = status_line.split(' ', 2)[:2]
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip().lower()
+
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get('content-length', 0)))
+
+    connection = headers.get('connection', '')
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+    return int(status), keep_alive
+
+
+def close(writer):
+    if writer is not None:
+        writer.close()
+    return None
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
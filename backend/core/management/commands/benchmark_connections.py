@@ -0,0 +1,86 @@
+import statistics
+import time
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.db.utils import ConnectionHandler
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the per-request cost of getting a database connection with fresh, '
+        'persistent and pooled connections'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Simulated requests per profile')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias to connect to')
+        parser.add_argument('--pool-size', type=int, default=4, help='max_size of the pool profile')
+
+    def handle(self, *args, **options):
+        base = {
+            key: value for key, value in settings.DATABASES[options['database']].items()
+            if key not in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'OPTIONS')
+        }
+        base_options = {
+            key: value for key, value in settings.DATABASES[options['database']].get('OPTIONS', {}).items()
+            if key != 'pool'
+        }
+        profiles = {
+            'fresh (CONN_MAX_AGE=0)': {'CONN_MAX_AGE': 0},
+            'persistent': {'CONN_MAX_AGE': None},
+            'persistent + health checks': {'CONN_MAX_AGE': None, 'CONN_HEALTH_CHECKS': True},
+        }
+        if base['ENGINE'] == 'django.db.backends.postgresql' and find_spec('psycopg_pool') is not None:
+            profiles['pool'] = {
+                'CONN_MAX_AGE': 0,
+                'OPTIONS': {**base_options, 'pool': {'min_size': 1, 'max_size': options['pool_size']}},
+            }
+        else:
+            self.stdout.write(self.style.WARNING('Pooling needs PostgreSQL with psycopg 3 and psycopg_pool; skipped'))
+
+        baseline = None
+        for label, profile in profiles.items():
+            timings = self.run(base, base_options, profile, options['requests'])
+            mean = statistics.mean(timings)
+            baseline = baseline or mean
+            self.stdout.write(
+                f'{label:>28}: mean {mean * 1000:7.3f} ms  p50 {percentile(timings, 50) * 1000:7.3f} ms  '
+                f'p99 {percentile(timings, 99) * 1000:7.3f} ms  ({baseline / mean:.1f}x)'
+            )
+
+    def run(self, base, base_options, profile, requests):
+        """
+        Time `requests` request cycles: Django's close_old_connections() when
+        the request starts, one query, and close_old_connections() again
+        when it finishes.
+        """
+        handler = ConnectionHandler({DEFAULT_DB_ALIAS: {'OPTIONS': base_options, **base, **profile}})
+        connection = handler[DEFAULT_DB_ALIAS]
+        timings = []
+        try:
+            # Warm up, e.g. open the pool, outside the timings.
+            self.request(connection)
+            for _ in range(requests):
+                start = time.perf_counter()
+                self.request(connection)
+                timings.append(time.perf_counter() - start)
+        finally:
+            connection.close()
+            if hasattr(connection, 'close_pool'):
+                connection.close_pool()
+        return timings
+
+    def request(self, connection):
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        connection.close_if_unusable_or_obsolete()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from core.compiled import compile_serializer
+from core.management.commands.benchmark_serializers import VIEWS, create_rows
+from core.renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+
+
+class Command(BaseCommand):
+    help = 'Compare the JSON and MessagePack renderers on the events, projects and users list payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows of each kind to create and render')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed renders per renderer; the best one counts')
+
+    def handle(self, *args, **options):
+        renderers = [('json (stdlib)', JSONRenderer())]
+        if orjson is not None:
+            renderers.append(('json (orjson)', FastJSONRenderer()))
+        else:
+            self.stdout.write(self.style.WARNING('orjson is not installed; FastJSONRenderer falls back to stdlib'))
+        if msgpack is not None:
+            renderers.append(('msgpack', MessagePackRenderer()))
+        else:
+            self.stdout.write(self.style.WARNING('msgpack is not installed'))
+
+        context = {'request': RequestFactory().get('/', HTTP_HOST='localhost')}
+
+        # Everything created for the benchmark is rolled back at the end.
+        with transaction.atomic():
+            create_rows(options['rows'])
+
+            for view_class in VIEWS:
+                compiled = compile_serializer(view_class.serializer_class)
+                results = compiled.render(list(compiled.values(view_class.queryset.all())), context)
+                data = {'count': len(results), 'next': None, 'previous': None, 'results': results}
+
+                self.stdout.write(f'{view_class.__name__} ({len(results)} rows)')
+                baseline = None
+                for label, renderer in renderers:
+                    elapsed = self.best_time(lambda: renderer.render(data), options['repeat'])
+                    size = len(renderer.render(data))
+                    baseline = baseline or elapsed
+                    self.stdout.write(
+                        f'  {label:>14}: {elapsed * 1000:8.2f} ms  {size / 1024:8.1f} KiB  '
+                        f'({baseline / elapsed:.1f}x)'
+                    )
+
+            transaction.set_rollback(True)
+
+    def best_time(self, function, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
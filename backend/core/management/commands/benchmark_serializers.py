@@ -0,0 +1,97 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+
+from core.compiled import compile_serializer
+from core.sparse import optimize_queryset
+from events.models import Event
+from events.views import EventListCreateView
+from projects.models import Project
+from projects.views import ProjectListCreateView
+from users.models import Domain, Role, User
+from users.views import UserListView
+
+VIEWS = [EventListCreateView, ProjectListCreateView, UserListView]
+
+
+class Command(BaseCommand):
+    help = 'Compare rows/sec of the DRF serializers and their compiled read path on the list querysets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows of each kind to create and serialize')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per serializer; the best one counts')
+
+    def handle(self, *args, **options):
+        context = {'request': RequestFactory().get('/', HTTP_HOST='localhost')}
+
+        # Everything created for the benchmark is rolled back at the end.
+        with transaction.atomic():
+            create_rows(options['rows'])
+
+            for view_class in VIEWS:
+                serializer_class = view_class.serializer_class
+                queryset = view_class.queryset.all()
+                compiled = compile_serializer(serializer_class)
+                if compiled is None:
+                    raise CommandError(f'{serializer_class.__name__} does not compile')
+
+                def drf():
+                    rows = optimize_queryset(queryset, serializer_class())
+                    return serializer_class(rows, many=True, context=context).data
+
+                def fast():
+                    return compiled.render(list(compiled.values(queryset)), context)
+
+                if json.dumps(drf()) != json.dumps(fast()):
+                    raise CommandError(f'{serializer_class.__name__}: compiled output differs')
+
+                count = queryset.count()
+                before = count / self.best_time(drf, options['repeat'])
+                after = count / self.best_time(fast, options['repeat'])
+                self.stdout.write(
+                    f'{serializer_class.__name__:>18}: {before:9.0f} rows/s -> {after:9.0f} rows/s '
+                    f'({after / before:.1f}x, {count} rows)'
+                )
+
+            transaction.set_rollback(True)
+
+    def best_time(self, function, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+
+def create_rows(rows):
+    """Create `rows` users, events and projects with their relations."""
+    roles = Role.objects.bulk_create([Role(name=f'Benchmark role {i}') for i in range(5)])
+    domains = Domain.objects.bulk_create([Domain(name=f'Benchmark domain {i}') for i in range(5)])
+    users = User.objects.bulk_create([
+        User(
+            username=f'benchmark-{i}', email=f'benchmark-{i}@example.com', name=f'Benchmark User {i}',
+            role=roles[i % 5], domain=domains[i % 5], skills=['python', 'django'],
+        )
+        for i in range(rows)
+    ])
+    Event.objects.bulk_create([
+        Event(name=f'Event {i}', date='2025-09-01', location='LHC', description='Details',
+              tags=['ai', 'web'], created_by=users[i % 10])
+        for i in range(rows)
+    ])
+    projects = Project.objects.bulk_create([
+        Project(name=f'Project {i}', description_short='Short', description_long='Long ' * 50,
+                tech_stack=['react', 'django'], created_by=users[i % 10])
+        for i in range(rows)
+    ])
+    Project.domains.through.objects.bulk_create([
+        Project.domains.through(project=project, domain=domains[i % 5]) for i, project in enumerate(projects)
+    ])
+    Project.team_members.through.objects.bulk_create([
+        Project.team_members.through(project=project, user=users[(i + j) % rows])
+        for i, project in enumerate(projects) for j in range(3)
+    ])
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.snapshots import DATASETS, export_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Export the public datasets as versioned, precompressed JSON files under SNAPSHOT_DIR'
+
+    def add_arguments(self, parser):
+        parser.add_argument('datasets', nargs='*', help=f"Datasets to export: {', '.join(DATASETS)} (default: all)")
+        parser.add_argument('--force', action='store_true', help='Rewrite datasets whose content did not change')
+
+    def handle(self, *args, **options):
+        unknown = [name for name in options['datasets'] if name not in DATASETS]
+        if unknown:
+            raise CommandError(f"Unknown dataset(s): {', '.join(unknown)}")
+
+        names = options['datasets'] or list(DATASETS)
+        written = export_snapshots(names, force=options['force'])
+        for name in names:
+            self.stdout.write(f"{name}: {'written' if name in written else 'unchanged'}")
+        self.stdout.write(self.style.SUCCESS('Snapshots are up to date'))
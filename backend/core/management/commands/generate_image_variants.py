@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.cache import bump_generation
+from core.images import generate_variants, variants_are_current
+from core.signals import IMAGE_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Generate resized variants for existing project images and profile pictures'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate variants that already exist')
+
+    def handle(self, *args, **options):
+        for model, (image_field, variants_field) in IMAGE_FIELDS.items():
+            generated = failed = 0
+            queryset = model._default_manager.exclude(**{image_field: ''}).only('pk', image_field, variants_field)
+            for instance in queryset.iterator():
+                field_file = getattr(instance, image_field)
+                if not options['force'] and variants_are_current(field_file, getattr(instance, variants_field)):
+                    continue
+                try:
+                    variants = generate_variants(field_file)
+                except (OSError, ValueError) as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'{model.__name__} {instance.pk}: {field_file.name}: {e}'))
+                    continue
+                # updated_at changes the ETags of responses showing the image.
+                model._default_manager.filter(pk=instance.pk).update(
+                    **{variants_field: variants, 'updated_at': timezone.now()}
+                )
+                generated += 1
+
+            if generated:
+                bump_generation(model)
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {generated} generated, {failed} failed')
+        self.stdout.write(self.style.SUCCESS('Image variants are up to date'))
@@ -0,0 +1,121 @@
+import re
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework import mixins
+
+POSTGRES_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (\w+)\b(?! USING)')
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the querysets behind every API view and admin changelist and '
+        'flag sequential scans over large tables'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-rows', type=int, default=1000,
+            help='Only flag sequential scans over tables with at least this many rows',
+        )
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan in full')
+        parser.add_argument('--fail', action='store_true', help='Exit with an error if anything is flagged')
+
+    def handle(self, *args, **options):
+        self.min_rows = options['min_rows']
+        self.verbose_plans = options['verbose_plans']
+        self.table_rows = {}
+
+        flagged = 0
+        for label, queryset in [*self.api_querysets(), *self.admin_querysets()]:
+            flagged += self.audit(label, queryset)
+
+        if flagged:
+            message = f'{flagged} sequential scan(s) over tables with >= {self.min_rows} rows'
+            if options['fail']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS('No sequential scans over large tables'))
+
+    def api_querysets(self):
+        page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 20
+        for route, view_class in self.api_views(get_resolver().url_patterns):
+            queryset = getattr(view_class, 'queryset', None)
+            if queryset is None:
+                continue
+            queryset = queryset.all()
+            if issubclass(view_class, mixins.ListModelMixin):
+                yield f'{view_class.__name__} {route} (list)', queryset[:page_size]
+            if issubclass(view_class, (mixins.RetrieveModelMixin, mixins.UpdateModelMixin)):
+                yield f'{view_class.__name__} {route} (detail)', queryset.filter(pk=1)
+
+    def api_views(self, patterns, prefix=''):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from self.api_views(pattern.url_patterns, prefix + str(pattern.pattern))
+            elif isinstance(pattern, URLPattern):
+                view_class = getattr(pattern.callback, 'cls', None)
+                if view_class is not None:
+                    yield prefix + str(pattern.pattern), view_class
+
+    def admin_querysets(self):
+        request = RequestFactory().get('/admin/')
+        request.user = get_user_model()(is_staff=True, is_superuser=True)
+        for model, model_admin in admin.site._registry.items():
+            label = f'{type(model_admin).__name__} changelist'
+            queryset = model_admin.get_queryset(request)
+            if model_admin.list_select_related is True:
+                queryset = queryset.select_related()
+            elif model_admin.list_select_related:
+                queryset = queryset.select_related(*model_admin.list_select_related)
+            yield label, queryset[:model_admin.list_per_page]
+
+            # Each simple list_filter, using a value that actually occurs.
+            for list_filter in model_admin.list_filter:
+                if not isinstance(list_filter, str) or '__' in list_filter:
+                    continue
+                value = queryset.model._default_manager.values_list(list_filter, flat=True).first()
+                if value is None:
+                    continue
+                filtered = queryset.model._default_manager.filter(**{list_filter: value})
+                yield f'{label} ?{list_filter}=', filtered[:model_admin.list_per_page]
+
+    def audit(self, label, queryset):
+        try:
+            plan = queryset.explain()
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'{label}: could not EXPLAIN ({e})'))
+            return 0
+
+        pattern = POSTGRES_SEQ_SCAN if connection.vendor == 'postgresql' else SQLITE_FULL_SCAN
+        flagged = 0
+        for table in sorted(set(pattern.findall(plan))):
+            rows = self.count_rows(table)
+            if rows >= self.min_rows:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f'{label}: sequential scan on {table} ({rows} rows)'))
+            else:
+                self.stdout.write(f'{label}: sequential scan on {table} ({rows} rows, below threshold)')
+
+        if self.verbose_plans:
+            self.stdout.write(plan)
+        return flagged
+
+    def count_rows(self, table):
+        if table not in self.table_rows:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    # The planner's estimate; exact enough and free on big tables.
+                    cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+                else:
+                    cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                row = cursor.fetchone()
+            self.table_rows[table] = max(row[0], 0) if row else 0
+        return self.table_rows[table]
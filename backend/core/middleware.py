@@ -0,0 +1,142 @@
+# core/middleware.py
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.renderers import JSONRenderer
+
+from . import db_router
+from .renderers import MessagePackRenderer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def parse_accept_encoding(header):
+    """Return {coding: q} for an Accept-Encoding header."""
+    codings = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses with brotli (when installed) or gzip, whichever the
+    client accepts and prefers, brotli winning ties.
+
+    Responses under COMPRESSION_MIN_SIZE bytes are left alone. Responses
+    that core.cache.CachedListMixin served carry a `compression_cache_key`;
+    when rendered as JSON or MessagePack, whose bytes depend on the data
+    alone, their compressed bytes are cached under it, so repeated hits on a
+    cached list skip recompressing the same body. Other renderers, like the
+    browsable API with its user and CSRF token, are compressed per request.
+    Streaming responses are gzipped as Django's GZipMiddleware does.
+    """
+    brotli_quality = 5
+    cacheable_renderers = (JSONRenderer, MessagePackRenderer)
+
+    def process_response(self, request, response):
+        if response.streaming:
+            return super().process_response(request, response)
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE or response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        cache_key = getattr(response, 'compression_cache_key', None)
+        renderer = getattr(response, 'accepted_renderer', None)
+        if cache_key is not None and isinstance(renderer, self.cacheable_renderers):
+            cache_key = 'compressed:{}'.format(hashlib.md5('{}:{}:{}'.format(
+                cache_key, getattr(response, 'accepted_media_type', ''), encoding,
+            ).encode()).hexdigest())
+            compressed = cache.get(cache_key)
+            if compressed is None:
+                compressed = self.compress(response.content, encoding)
+                cache.set(cache_key, compressed, settings.RESPONSE_CACHE_TIMEOUT)
+        else:
+            compressed = self.compress(response.content, encoding)
+
+        # Return the compressed content only if it's actually shorter.
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        # Compressed bytes differ from the identity encoding, so a strong
+        # ETag must become weak (RFC 9110 8.8.1); it still matches
+        # If-None-Match, which uses the weak comparison.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def negotiate(self, header):
+        codings = parse_accept_encoding(header)
+        available = ['br', 'gzip'] if brotli is not None else ['gzip']
+        best, best_q = None, 0.0
+        for coding in available:
+            q = codings.get(coding, codings.get('*', 0.0))
+            if q > best_q:
+                best, best_q = coding, q
+        return best
+
+    def compress(self, content, encoding):
+        if encoding == 'br':
+            return brotli.compress(content, quality=self.brotli_quality)
+        return compress_string(content, max_random_bytes=self.max_random_bytes)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Scope core.db_router's routing to the request, and send the reads of
+    views with `read_from_replica = True` to a replica on GET and HEAD.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = db_router.start_request()
+        try:
+            return self.get_response(request)
+        finally:
+            db_router.end_request(token)
+
+    async def __acall__(self, request):
+        token = db_router.start_request()
+        try:
+            return await self.get_response(request)
+        finally:
+            db_router.end_request(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if request.method in SAFE_METHODS and getattr(view_class, 'read_from_replica', False):
+            db_router.use_replica()
@@ -0,0 +1,39 @@
+# core/operations.py
+from django.db.migrations.operations.base import Operation
+
+
+class PostgresOnly(Operation):
+    """
+    Wrap a migration operation that only makes sense on PostgreSQL (GIN
+    indexes, tsvector triggers, ...). The project state always changes, so the
+    models and migrations stay in sync, but the database is only touched when
+    it is PostgreSQL; SQLite development and test databases skip it.
+    """
+
+    def __init__(self, operation):
+        self.operation = operation
+
+    @property
+    def reversible(self):
+        return self.operation.reversible
+
+    def deconstruct(self):
+        return (self.__class__.__qualname__, [self.operation], {})
+
+    def state_forwards(self, app_label, state):
+        self.operation.state_forwards(app_label, state)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            self.operation.database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            self.operation.database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return f'{self.operation.describe()} (PostgreSQL only)'
+
+    @property
+    def migration_name_fragment(self):
+        return self.operation.migration_name_fragment
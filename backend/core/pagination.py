@@ -0,0 +1,173 @@
+# core/pagination.py
+import base64
+import json
+from types import SimpleNamespace
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination that switches to keyset (cursor) pagination when
+    the request carries `?cursor=` or `?pagination=cursor`.
+
+    Keyset pages are read with `WHERE (key) > (last key seen)` on the
+    queryset's own ordering instead of COUNT(*) and OFFSET, so they cost the
+    same on the last page as on the first and don't shift when rows are
+    inserted. The ordering must end with the primary key to make the key
+    unique, and should be backed by a matching composite index.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.use_keyset(request, queryset)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        return self.keyset_page(list(self.keyset_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views."""
+        self.keyset = self.use_keyset(request, queryset)
+        if self.keyset:
+            return self.keyset_page([row async for row in self.keyset_queryset(queryset, request)])
+
+        # PageNumberPagination.paginate_queryset(), with the count and the
+        # page read through the async ORM.
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+        self.page.object_list = [row async for row in self.page.object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+    def keyset_queryset(self, queryset, request):
+        """The rows of the requested keyset page, plus one to tell if there's more."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.ordering = self.get_ordering(queryset)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        ordering = [reverse_order(field) for field in self.ordering] if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self.after(ordering, self.position))
+        return queryset[:self.page_size + 1]
+
+    def keyset_page(self, results):
+        page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if self.reverse:
+            page.reverse()
+
+        self.page = page
+        self.has_next = (self.position is not None) if self.reverse else has_more
+        self.has_previous = has_more if self.reverse else (self.position is not None)
+        return page
+
+    def use_keyset(self, request, queryset):
+        if self.cursor_query_param not in request.query_params \
+                and request.query_params.get(self.mode_query_param) != 'cursor':
+            return False
+        ordering = self.get_ordering(queryset)
+        return bool(ordering) and ordering[-1].lstrip('-') in ('id', 'pk')
+
+    def get_ordering(self, queryset):
+        return list(queryset.query.order_by or queryset.model._meta.ordering)
+
+    def after(self, ordering, position):
+        """
+        Build `(f1, f2, ...) > (v1, v2, ...)` for a mixed-direction ordering,
+        expanded as f1 > v1 OR (f1 = v1 AND f2 > v2) OR ...
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            values = cursor['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model_field(field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+            return position, bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse):
+        if isinstance(instance, dict):
+            # A .values() row, as read by core.compiled.
+            instance = SimpleNamespace(**{
+                self.model_field(field).attname: instance[field.lstrip('-')] for field in self.ordering
+            })
+        values = [
+            self.model_field(field).value_to_string(instance)
+            for field in self.ordering
+        ]
+        cursor = json.dumps({'p': values, 'r': int(reverse)}, separators=(',', ':'))
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        encoded = base64.urlsafe_b64encode(cursor.encode()).decode()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def model_field(self, field):
+        name = field.lstrip('-')
+        meta = self.model._meta
+        return meta.pk if name == 'pk' else meta.get_field(name)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+def reverse_order(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
@@ -0,0 +1,99 @@
+# core/public.py
+"""
+Anonymous read access for the public pages.
+
+Views with `public_fields` answer anonymous GET/HEAD requests with just
+those fields, when settings.PUBLIC_READ_ENABLED is on. Every anonymous
+visitor gets the same bytes, so these responses are marked
+`Cache-Control: public, s-maxage=...` for a CDN or reverse proxy to serve;
+authenticated responses stay private. All responses vary on Authorization,
+so a shared cache never hands the public version to a signed-in user.
+
+Views whose whole response is public, the same for everyone, use
+PublicReadPermission and public_cache_control() instead.
+"""
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from rest_framework import permissions
+
+from .sparse import ALL, parse_selection
+
+
+def is_public_read(request, view):
+    """Whether `request` is an anonymous read `view` serves publicly."""
+    return (
+        settings.PUBLIC_READ_ENABLED
+        and getattr(view, 'public_fields', None) is not None
+        and request.method in permissions.SAFE_METHODS
+        and not request.user.is_authenticated
+    )
+
+
+def public_cache_control():
+    """Cache-Control directives for responses every anonymous reader shares."""
+    # Browsers revalidate with the ETag; shared caches keep the response for
+    # PUBLIC_READ_S_MAXAGE seconds.
+    return {'public': True, 'max_age': 0, 's_maxage': settings.PUBLIC_READ_S_MAXAGE}
+
+
+class PublicReadPermission(permissions.BasePermission):
+    """Anyone may read while PUBLIC_READ_ENABLED is on; otherwise log in."""
+
+    def has_permission(self, request, view):
+        if request.method in permissions.SAFE_METHODS and settings.PUBLIC_READ_ENABLED:
+            return True
+        return request.user.is_authenticated
+
+
+def restrict_selection(selection, allowed):
+    """The part of a sparse fieldset `selection` that `allowed` permits."""
+    if selection is ALL:
+        return allowed
+    if allowed is ALL:
+        return selection
+    return {
+        name: restrict_selection(selection[name], allowed[name])
+        for name in selection if name in allowed
+    }
+
+
+class PublicReadViewMixin:
+    """
+    Serve `public_fields` (field paths as in `?fields=`) to anonymous readers
+    of a SparseFieldsViewMixin view. The view's permission classes decide
+    whether anonymous reads are let in at all, through is_public_read().
+    Must come before SparseFieldsViewMixin, ConditionalGetMixin and
+    CachedListMixin.
+    """
+    public_fields = None
+
+    def is_public_read(self):
+        return is_public_read(self.request, self)
+
+    def get_selection(self):
+        selection = super().get_selection()
+        if self.is_public_read():
+            return restrict_selection(selection, parse_selection(','.join(self.public_fields)))
+        return selection
+
+    def make_cache_key(self, request, generations):
+        key = super().make_cache_key(request, generations)
+        return key + ':public' if self.is_public_read() else key
+
+    def make_validators(self, request, values, generations, generation_models):
+        etag, *validators = super().make_validators(request, values, generations, generation_models)
+        if self.is_public_read():
+            etag = '"{}"'.format(hashlib.md5(f'{etag}:public'.encode()).hexdigest())
+        return (etag, *validators)
+
+    def get_cache_control(self):
+        if self.is_public_read():
+            return public_cache_control()
+        return super().get_cache_control()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ['Authorization'])
+        return response
@@ -0,0 +1,60 @@
+# core/renderers.py
+"""
+Renderers for the API.
+
+FastJSONRenderer encodes with orjson when it is installed and produces the
+same bytes as DRF's JSONRenderer, falling back to it otherwise and for the
+options orjson can't honour. MessagePackRenderer serves
+`Accept: application/msgpack` when msgpack is installed; settings.py only
+registers it then.
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .timing import measure
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure('render'):
+            return self.encode(data, accepted_media_type, renderer_context)
+
+    def encode(self, data, accepted_media_type, renderer_context):
+        if orjson is None or self.ensure_ascii or not self.compact \
+                or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        # OPT_UTC_Z writes UTC datetimes with 'Z' like DRF's encoder; the
+        # default hook handles what orjson doesn't (Decimal, lazy strings...).
+        ret = orjson.dumps(
+            data, default=JSONEncoder().default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+        # Escaped by DRF too, so the output is valid JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        with measure('render'):
+            return msgpack.packb(data, default=JSONEncoder().default, use_bin_type=True)
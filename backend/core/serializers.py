@@ -0,0 +1,17 @@
+# core/serializers.py
+from rest_framework import serializers
+
+from .images import srcset
+
+
+class SrcsetField(serializers.ReadOnlyField):
+    """
+    Read-only srcset strings, one per format, for a variant map produced by
+    core.images. URLs are absolute when the request is available, like DRF's
+    ImageField.
+    """
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        build_url = request.build_absolute_uri if request is not None else str
+        return srcset(value, build_url)
@@ -0,0 +1,126 @@
+# core/sideload.py
+"""
+Normalized list responses: `?normalize=1`.
+
+Nested users, domains and roles are rendered once each in an `included` map
+keyed by type and id, and the rows refer to them by id:
+
+    {"results": [{"id": 1, "created_by_data": 3, "domains_data": [2]}, ...],
+     "included": {"users": {"3": {...}}, "domains": {"2": {...}}, ...}}
+
+Each instance is serialized once per page rather than once per reference, so
+pages where a few officers own most of the content are cheaper to build and
+smaller on the wire.
+"""
+from django.db import models
+from rest_framework import permissions, serializers
+
+
+class IncludedMap(dict):
+    """{type: {id: data}}, remembering which renderings were already made."""
+
+    def __init__(self):
+        super().__init__()
+        self.rendered = set()
+
+
+class SideloadedField(serializers.Field):
+    """
+    Stands in for a nested serializer field in normalized responses: renders
+    the id (or list of ids) and adds the instance to the included map.
+    """
+
+    def __init__(self, child, many=False, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.child = child
+        self.many = many
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        self.child.bind(field_name='', parent=self)
+
+    def to_representation(self, value):
+        if self.many:
+            items = value.all() if isinstance(value, models.manager.BaseManager) else value
+            return [self.sideload(item) for item in items]
+        return self.sideload(value)
+
+    def sideload(self, instance):
+        included = self.context['included']
+        entries = included.setdefault(self.child.included_key, {})
+        # Serializers with the same fields render the same data, so each
+        # instance only needs rendering once per distinct selection.
+        key = (self.child.included_key, instance.pk, repr(self.child.get_selection()))
+        if key not in included.rendered:
+            included.rendered.add(key)
+            entries[instance.pk] = {**entries.get(instance.pk, {}), **self.child.to_representation(instance)}
+        return instance.pk
+
+
+class SideloadMixin:
+    """
+    Serializer mixin for normalized responses.
+
+    When the context carries an `included` map, nested serializer fields
+    whose serializer sets `included_key` are side-loaded instead of embedded.
+    `sideload_related` maps a foreign key field to the serializer to
+    side-load it with and the flattened fields (e.g. `role_name`) it
+    replaces.
+    """
+    included_key = None
+    sideload_related = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('included') is None:
+            return fields
+
+        for name, field in list(fields.items()):
+            child = getattr(field, 'child', field)
+            if isinstance(child, SideloadMixin) and child.included_key:
+                fields[name] = SideloadedField(child, many=child is not field, source=field.source)
+
+        for name, (serializer_class, replaced) in self.sideload_related.items():
+            for replaced_name in replaced:
+                fields.pop(replaced_name, None)
+            if name in fields:
+                fields[name] = SideloadedField(serializer_class(), source=fields[name].source)
+        return fields
+
+
+class SideloadViewMixin:
+    """
+    Support `?normalize=1` on a list view whose serializer uses
+    SideloadMixin. Must come after CachedListMixin, so cached responses
+    keep their included map.
+    """
+    normalize_query_param = 'normalize'
+
+    def is_normalized(self):
+        return (
+            self.request.method in permissions.SAFE_METHODS
+            and self.request.query_params.get(self.normalize_query_param) in ('1', 'true')
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.is_normalized():
+            if not hasattr(self, '_included'):
+                self._included = IncludedMap()
+            context['included'] = self._included
+        return context
+
+    def list(self, request, *args, **kwargs):
+        return self.add_included(super().list(request, *args, **kwargs))
+
+    async def alist(self, request, *args, **kwargs):
+        return self.add_included(await super().alist(request, *args, **kwargs))
+
+    def add_included(self, response):
+        if self.is_normalized() and response.status_code == 200:
+            included = dict(getattr(self, '_included', {}))
+            if isinstance(response.data, list):
+                response.data = {'results': response.data}
+            response.data['included'] = included
+        return response
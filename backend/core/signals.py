@@ -0,0 +1,72 @@
+# core/signals.py
+import logging
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from events.models import Event
+from projects.models import Project, ProjectDomain, ProjectTeamMember
+from users.models import Domain, Role, User
+from .cache import bump_generation
+from .images import generate_variants, variants_are_current
+from .snapshots import schedule_export
+
+logger = logging.getLogger(__name__)
+
+CACHED_MODELS = [Event, Project, ProjectTeamMember, ProjectDomain, Domain, Role, User]
+
+# model -> (image field, variant map field)
+IMAGE_FIELDS = {
+    Project: ('image', 'image_variants'),
+    User: ('profile_pic', 'profile_pic_variants'),
+}
+
+
+def invalidate_model(sender, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no cached response includes.
+    if sender is User and update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_generation(sender)
+    schedule_export(sender)
+
+
+def invalidate_m2m(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_generation(sender)
+        schedule_export(sender)
+
+
+def update_image_variants(sender, instance, update_fields=None, **kwargs):
+    image_field, variants_field = IMAGE_FIELDS[sender]
+    if update_fields is not None and image_field not in update_fields:
+        return
+    field_file = getattr(instance, image_field)
+    if variants_are_current(field_file, getattr(instance, variants_field)):
+        return
+
+    variants = {}
+    if field_file:
+        try:
+            variants = generate_variants(field_file)
+        except (OSError, ValueError):
+            # The row is saved already; serve the original image instead.
+            logger.exception('Generating variants for %s %s failed', sender.__name__, instance.pk)
+    # update() so the new map doesn't trigger another round of signals; it
+    # skips auto_now, so set updated_at for the ETags (core.conditional).
+    updated_at = timezone.now()
+    sender._default_manager.filter(pk=instance.pk).update(**{variants_field: variants, 'updated_at': updated_at})
+    setattr(instance, variants_field, variants)
+    instance.updated_at = updated_at
+    bump_generation(sender)
+    schedule_export(sender)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_model, sender=model, dispatch_uid=f'cache-{model._meta.label_lower}-save')
+    post_delete.connect(invalidate_model, sender=model, dispatch_uid=f'cache-{model._meta.label_lower}-delete')
+
+for through in [Project.domains.through, Project.team_members.through]:
+    m2m_changed.connect(invalidate_m2m, sender=through, dispatch_uid=f'cache-{through._meta.label_lower}-m2m')
+
+for model in IMAGE_FIELDS:
+    post_save.connect(update_image_variants, sender=model, dispatch_uid=f'images-{model._meta.label_lower}-save')
@@ -0,0 +1,194 @@
+# core/snapshots.py
+"""
+Static JSON snapshots of the public datasets.
+
+The events, projects, team and domains datasets are rendered with their
+public fields to SNAPSHOT_DIR (served at SNAPSHOT_URL) as
+
+    <name>.<version>.json, .json.gz and .json.br (when brotli is installed)
+
+where the version is a hash of the content, so the files can be cached
+forever and served precompressed by any static server or CDN without
+reaching Django. manifest.json maps each dataset to its current file and
+is the only file clients need to revalidate.
+
+`manage.py export_snapshots` renders every dataset and writes only the ones
+whose content changed. With SNAPSHOT_EXPORT_ON_WRITE on, the signal
+handlers in core/signals.py also re-export the datasets built from a model
+once a transaction writing to it commits.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from events.models import Event
+from events.serializers import EventSerializer
+from events.views import PUBLIC_EVENT_FIELDS
+from projects.models import Project, ProjectDomain, ProjectTeamMember
+from projects.serializers import ProjectSerializer
+from projects.views import PUBLIC_PROJECT_FIELDS, get_project_queryset
+from users.models import Domain, Role, User
+from users.serializers import PUBLIC_MEMBER_FIELDS, DomainSerializer, UserSerializer
+from .compiled import compile_serializer
+from .middleware import brotli
+from .renderers import FastJSONRenderer
+from .sparse import ALL, optimize_queryset, parse_selection
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+# Versions kept on disk per dataset, so clients that loaded the previous
+# manifest can still fetch what it points to.
+KEEP_VERSIONS = 2
+
+
+class Dataset:
+    """
+    A public dataset: every row of `queryset` rendered by `serializer_class`
+    with `fields` (paths as in `?fields=`, or None for all of them).
+    `models` lists every model whose rows appear in it.
+    """
+
+    def __init__(self, name, queryset, serializer_class, fields, models):
+        self.name = name
+        self.queryset = queryset
+        self.serializer_class = serializer_class
+        self.selection = parse_selection(','.join(fields)) if fields else ALL
+        self.models = models
+
+    def render(self):
+        context = {'selection': self.selection}
+        compiled = compile_serializer(self.serializer_class, self.selection)
+        if compiled is not None:
+            results = compiled.render(list(compiled.values(self.queryset.all())), context)
+        else:
+            queryset = optimize_queryset(self.queryset.all(), self.serializer_class(context=context), self.selection)
+            results = self.serializer_class(queryset, many=True, context=context).data
+        return FastJSONRenderer().render({'count': len(results), 'results': results})
+
+
+DATASETS = {dataset.name: dataset for dataset in [
+    Dataset(
+        'events', Event.objects.order_by('-date', 'id'), EventSerializer, PUBLIC_EVENT_FIELDS,
+        [Event, User, Role, Domain],
+    ),
+    Dataset(
+        'projects', get_project_queryset(), ProjectSerializer, PUBLIC_PROJECT_FIELDS,
+        [Project, ProjectTeamMember, ProjectDomain, Domain, Role, User],
+    ),
+    Dataset(
+        'team', User.objects.filter(is_active=True).order_by('name', 'id'), UserSerializer,
+        PUBLIC_MEMBER_FIELDS,
+        [User, Role, Domain],
+    ),
+    Dataset('domains', Domain.objects.order_by('name', 'id'), DomainSerializer, None, [Domain]),
+]}
+
+
+def read_manifest():
+    try:
+        with open(os.path.join(settings.SNAPSHOT_DIR, MANIFEST), 'rb') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _write(path, content):
+    """Write `content` to `path` atomically, so readers never see half a file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _prune(name, keep):
+    """Delete the files of `name`'s versions other than `keep`."""
+    prefix = name + '.'
+    for filename in os.listdir(settings.SNAPSHOT_DIR):
+        if filename.startswith(prefix) and filename.split('.')[1] not in keep:
+            os.unlink(os.path.join(settings.SNAPSHOT_DIR, filename))
+
+
+def export_snapshots(names=None, force=False):
+    """
+    Render the datasets in `names` (all of them by default) and write the
+    ones whose content changed, or all of them with `force`. Returns the
+    names of the datasets written.
+    """
+    os.makedirs(settings.SNAPSHOT_DIR, exist_ok=True)
+    names = list(DATASETS) if names is None else names
+    rendered = {}
+    for name in names:
+        content = DATASETS[name].render()
+        rendered[name] = (content, hashlib.sha256(content).hexdigest()[:12])
+
+    manifest = read_manifest()
+    written = []
+    for name, (content, version) in rendered.items():
+        entry = manifest.get(name)
+        if entry is not None and entry['version'] == version and not force:
+            continue
+        filename = f'{name}.{version}.json'
+        path = os.path.join(settings.SNAPSHOT_DIR, filename)
+        _write(path, content)
+        _write(path + '.gz', gzip.compress(content, mtime=0))
+        if brotli is not None:
+            _write(path + '.br', brotli.compress(content))
+        written.append(name)
+
+        previous = [entry['version']] if entry is not None else []
+        _prune(name, keep=([version] + previous)[:KEEP_VERSIONS])
+        manifest[name] = {
+            'file': filename,
+            'version': version,
+            'count': json.loads(content)['count'],
+            'generated_at': timezone.now().isoformat(),
+        }
+
+    if written:
+        # Another export may have finished meanwhile; keep its entries.
+        manifest = {**read_manifest(), **{name: manifest[name] for name in written}}
+        _write(os.path.join(settings.SNAPSHOT_DIR, MANIFEST), json.dumps(manifest, indent=2).encode())
+    return written
+
+
+_pending = threading.local()
+
+
+def schedule_export(model):
+    """
+    Re-export the datasets built from `model` once the current transaction
+    commits, once per transaction however many rows it writes.
+    """
+    if not settings.SNAPSHOT_EXPORT_ON_WRITE:
+        return
+    names = {name for name, dataset in DATASETS.items() if model in dataset.models}
+    if not names:
+        return
+    _pending.__dict__.setdefault('names', set()).update(names)
+    transaction.on_commit(_export_pending)
+
+
+def _export_pending():
+    # The first callback of a transaction exports everything it wrote;
+    # names left over from a rolled back one are just exported again.
+    names, _pending.names = getattr(_pending, 'names', set()), set()
+    if not names:
+        return
+    try:
+        export_snapshots(sorted(names))
+    except Exception:
+        logger.exception('Exporting snapshots %s failed', ', '.join(sorted(names)))
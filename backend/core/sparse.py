@@ -0,0 +1,217 @@
+# core/sparse.py
+"""
+Sparse fieldsets: `?fields=` on the API views.
+
+`?fields=id,name,created_by_data.name` renders only those fields, with dotted
+paths selecting fields of nested serializers; naming a nested relation, as in
+`?fields=id,domains_data`, renders all of its fields. Without `?fields=` every
+field is rendered, as before.
+
+The selection is applied to the SQL as well as to the JSON. The view's
+queryset is rebuilt from the serializer: `.only()` the columns the selected
+fields read, `select_related()` the nested foreign keys and `prefetch_related()`
+the nested many-relations, so unrequested columns and relations are never
+loaded at all.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import permissions, serializers
+from rest_framework.exceptions import ParseError
+
+ALL = None
+
+
+def parse_selection(fields):
+    """
+    Turn the comma-separated query parameter into a nested dict of field
+    names, where ALL stands for every field of that serializer.
+    """
+    fields = [path.strip() for path in fields.split(',') if path.strip()]
+    if not fields:
+        return ALL
+
+    selection = {}
+    for path in fields:
+        node = selection
+        *parents, leaf = path.split('.')
+        for name in parents:
+            if name in node and node[name] is ALL:
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[leaf] = ALL
+    return selection
+
+
+def get_model_field(model, attr):
+    """Look up a model field by attribute name, including reverse accessors."""
+    for relation in model._meta.related_objects:
+        if relation.get_accessor_name() == attr:
+            return relation
+    return model._meta.get_field(attr)
+
+
+def nested_serializer(field):
+    """The serializer behind a nested field, or None for a plain field."""
+    field = getattr(field, 'child', field)
+    return field if isinstance(field, serializers.BaseSerializer) else None
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin that renders only the fields in the selection.
+
+    The top-level serializer reads the selection from `context['selection']`
+    (see SparseFieldsViewMixin) and hands each nested serializer its part.
+    `sparse_requires` names model fields a serializer field reads besides its
+    source, so the queryset can load them too.
+    """
+    sparse_requires = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.get_selection()
+        if selection is ALL:
+            return fields
+
+        fields = {name: field for name, field in fields.items() if name in selection}
+        for name, field in fields.items():
+            nested = nested_serializer(field)
+            if isinstance(nested, SparseFieldsMixin):
+                nested._selection = selection[name]
+        return fields
+
+    def get_selection(self):
+        if hasattr(self, '_selection'):
+            return self._selection
+        if self.root is self or self.root is self.parent:
+            return self.context.get('selection', ALL)
+        return ALL
+
+
+def optimize_queryset(queryset, serializer, selection=ALL, required=()):
+    """
+    Restrict `queryset` to the columns and relations `serializer` renders for
+    `selection`, plus the `required` fields, replacing any select_related()/
+    prefetch_related() it had.
+    """
+    only, select_related, prefetches, restricted = _plan(serializer, selection, queryset.model, prefix='')
+
+    if restricted:
+        only.update(required)
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        only |= {field.lstrip('-') for field in ordering if isinstance(field, str) and '__' not in field}
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if restricted:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+def _plan(serializer, selection, model, prefix):
+    """
+    Return (only, select_related, prefetches, restricted) for the fields of
+    `serializer` in `selection`, with paths relative to the root queryset.
+    `restricted` is False when a field reads something other than model
+    fields, in which case every column has to be loaded.
+    """
+    only = {prefix + model._meta.pk.name}
+    select_related = []
+    prefetches = []
+    restricted = True
+
+    fields = {name: field for name, field in serializer.fields.items() if not field.write_only}
+    if selection is not ALL:
+        unknown = [name for name in selection if name not in fields]
+        if unknown:
+            raise ParseError(f"Unknown field(s): {', '.join(prefix + name for name in unknown)}")
+        fields = {name: field for name, field in fields.items() if name in selection}
+
+    for name, field in fields.items():
+        sub_selection = ALL if selection is ALL else selection[name]
+        nested = nested_serializer(field)
+        if sub_selection is not ALL and nested is None:
+            raise ParseError(f'Field {prefix}{name} has no nested fields')
+
+        only |= {prefix + required for required in getattr(serializer, 'sparse_requires', {}).get(name, ())}
+        if field.source == '*':
+            restricted = False
+            continue
+
+        # Follow the source through foreign keys to the field it reads.
+        current, path = model, prefix
+        *hops, attr = field.source.split('.')
+        try:
+            for hop in hops:
+                hop_field = get_model_field(current, hop)
+                if not (hop_field.many_to_one or hop_field.one_to_one) or not hop_field.concrete:
+                    raise FieldDoesNotExist
+                only.add(path + hop)
+                select_related.append(path + hop)
+                current, path = hop_field.related_model, f'{path}{hop}__'
+            model_field = get_model_field(current, attr)
+        except FieldDoesNotExist:
+            restricted = False
+            continue
+
+        if model_field.many_to_many or model_field.one_to_many:
+            related_model = model_field.related_model
+            if nested is None:
+                prefetches.append(path + attr)
+                continue
+            # A reverse foreign key's prefetch is matched back to the parents
+            # on the foreign key column, so that has to be loaded too.
+            required = [model_field.field.name] if model_field.one_to_many else []
+            child_queryset = optimize_queryset(related_model._default_manager.all(), nested, sub_selection, required)
+            prefetches.append(Prefetch(path + attr, queryset=child_queryset))
+        elif model_field.is_relation and nested is not None:
+            only.add(path + attr)
+            select_related.append(path + attr)
+            child = _plan(nested, sub_selection, model_field.related_model, f'{path}{attr}__')
+            only |= child[0]
+            select_related += child[1]
+            prefetches += child[2]
+            restricted = restricted and child[3]
+        else:
+            only.add(path + attr)
+
+    return only, select_related, prefetches, restricted
+
+
+class SparseFieldsViewMixin:
+    """
+    Support `?fields=` on a generic view whose serializer uses
+    SparseFieldsMixin. Only reads are affected; writes always accept and
+    return every field.
+    """
+    fields_query_param = 'fields'
+
+    def get_selection(self):
+        if not hasattr(self, '_selection'):
+            params = self.request.query_params
+            if self.request.method in permissions.SAFE_METHODS:
+                if 'expand' in params:
+                    # Nested relations are already rendered in full; a client
+                    # relying on the old parameter would silently lose them.
+                    raise ParseError('expand is not supported; name nested relations in fields instead')
+                self._selection = parse_selection(params.get(self.fields_query_param, ''))
+            else:
+                self._selection = ALL
+        return self._selection
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in permissions.SAFE_METHODS:
+            # Plan from every field the response format has, then validate
+            # and apply the selection against them.
+            serializer = self.get_serializer_class()(context={**self.get_serializer_context(), 'selection': ALL})
+            queryset = optimize_queryset(queryset, serializer, self.get_selection())
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['selection'] = self.get_selection()
+        return context
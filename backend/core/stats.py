@@ -0,0 +1,73 @@
+# core/stats.py
+"""
+Counts for the dashboard and landing pages, so they don't have to download
+whole lists to tally them. Each breakdown is one grouped query; the result
+is cached under the core.cache generations of the models it counts, so any
+write to them makes it stale at once.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+from events.models import Event
+from projects.models import Project, ProjectDomain
+from users.models import Domain, Role, User
+from .cache import get_generations
+
+STATS_MODELS = [Project, ProjectDomain, Domain, Role, User, Event]
+
+
+def _members_by(field):
+    """Active members per `field` (a foreign key), members without one under a None id."""
+    rows = (
+        User.objects.filter(is_active=True)
+        .values(f'{field}_id', f'{field}__name')
+        .annotate(count=Count('id'))
+        .order_by(f'{field}__name')
+    )
+    return [{'id': row[f'{field}_id'], 'name': row[f'{field}__name'], 'count': row['count']} for row in rows]
+
+
+def compute_stats():
+    status_counts = dict(Project.objects.values_list('status').annotate(count=Count('id')).order_by())
+    projects_by_status = [
+        {'status': status, 'label': str(label), 'count': status_counts.get(status, 0)}
+        for status, label in Project.STATUS_CHOICES
+    ]
+    projects_by_domain = list(
+        Domain.objects.annotate(count=Count('projectdomain')).values('id', 'name', 'count').order_by('name')
+    )
+    members_by_role = _members_by('role')
+    members_by_domain = _members_by('domain')
+    members_by_batch = list(
+        User.objects.filter(is_active=True).values('batch').annotate(count=Count('id')).order_by('batch')
+    )
+    events_by_month = [
+        {'month': month.strftime('%Y-%m'), 'count': count}
+        for month, count in Event.objects.annotate(month=TruncMonth('date'))
+        .values_list('month').annotate(count=Count('id')).order_by('month')
+    ]
+    return {
+        'totals': {
+            'projects': sum(row['count'] for row in projects_by_status),
+            'members': sum(row['count'] for row in members_by_role),
+            'events': sum(row['count'] for row in events_by_month),
+            'domains': len(projects_by_domain),
+        },
+        'projects_by_status': projects_by_status,
+        'projects_by_domain': projects_by_domain,
+        'members_by_role': members_by_role,
+        'members_by_domain': members_by_domain,
+        'members_by_batch': members_by_batch,
+        'events_by_month': events_by_month,
+    }
+
+
+def get_dashboard_stats():
+    key = 'stats:{}'.format('.'.join(str(generation) for generation in get_generations(STATS_MODELS)))
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_stats()
+        cache.set(key, stats, settings.RESPONSE_CACHE_TIMEOUT)
+    return stats
@@ -0,0 +1,1194 @@
+import datetime
+import decimal
+import gzip
+import json
+import re
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock, skipIf
+
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from PIL import Image as PILImage
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from events.models import Event
+from events.views import EventDetailView, EventListCreateView
+from events.serializers import EventSerializer
+from projects.models import Project
+from projects.serializers import ProjectSerializer
+from projects.views import ProjectDetailView, ProjectListCreateView
+from users.models import Domain, Role, User
+from users.serializers import UserSerializer
+from users.views import DomainListView, RoleListView, UserDetailView, UserListView
+from . import db_router
+from .cache import get_stats
+from .compiled import COMPILED_CACHE_SIZE, _compile, compile_serializer
+from .middleware import CompressionMiddleware, brotli
+from .pagination import KeysetPagination
+from .renderers import FastJSONRenderer, msgpack
+from .snapshots import read_manifest
+from .sparse import parse_selection
+from .timing import RequestTimingMiddleware
+
+
+class ResponseCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Coordinator', can_manage_projects=True)
+        cls.domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='coordinator', email='coordinator@example.com', name='Coordinator',
+            role=cls.role, domain=cls.domain,
+        )
+        cls.project = Project.objects.create(name='Website', description_short='Short', created_by=cls.user)
+        cls.project.domains.set([cls.domain])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('projects:project-list-create')
+
+    def test_repeated_reads_are_served_from_the_cache(self):
+        first = self.client.get(self.url)
+        # Only the ETag aggregate.
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(get_stats()['hits'], 1)
+        self.assertEqual(get_stats()['misses'], 1)
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url, {'page': 2})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(get_stats()['hits'], 0)
+
+    def test_host_is_part_of_the_key(self):
+        self.client.get(self.url, HTTP_HOST='localhost')
+        response = self.client.get(self.url, HTTP_HOST='127.0.0.1')
+        picture = response.data['results'][0]['created_by_data']['profile_pic']
+        self.assertTrue(picture.startswith('http://127.0.0.1/'), picture)
+        self.assertEqual(get_stats()['hits'], 0)
+
+    def test_writes_to_nested_models_invalidate(self):
+        self.client.get(self.url)
+
+        self.domain.name = 'Web'
+        self.domain.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['domains_data'][0]['name'], 'Web')
+
+        self.user.name = 'Renamed'
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['created_by_data']['name'], 'Renamed')
+
+    def test_membership_changes_invalidate(self):
+        self.client.get(self.url)
+        self.project.set_team_members([self.user.pk])
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results'][0]['team_members_data']), 1)
+
+    def test_deletes_invalidate(self):
+        Event.objects.create(name='Hackathon', date='2025-09-01', location='LHC', created_by=self.user)
+        url = reverse('events:event-list-create')
+        self.assertEqual(self.client.get(url).data['count'], 1)
+        Event.objects.all().delete()
+        self.assertEqual(self.client.get(url).data['count'], 0)
+
+    def test_stats_require_staff(self):
+        self.assertEqual(self.client.get(reverse('core:cache-stats')).status_code, 403)
+        self.user.is_staff = True
+        response = self.client.get(reverse('core:cache-stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('hit_rate', response.data)
+
+
+class ConditionalGetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        cls.domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='coordinator', email='coordinator@example.com', name='Coordinator',
+            role=cls.role, domain=cls.domain,
+        )
+        cls.event = Event.objects.create(name='Hackathon', date='2025-09-01', location='LHC', created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_list_returns_304_when_unchanged(self):
+        url = reverse('events:event-list-create')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_detail_etag_changes_with_the_row(self):
+        url = reverse('events:event-detail', args=[self.event.pk])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.event.name = 'Hackathon 2025'
+        self.event.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_nested_changes_change_the_etag(self):
+        url = reverse('events:event-list-create')
+        etag = self.client.get(url)['ETag']
+        self.role.name = 'Lead'
+        self.role.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['created_by_data']['role_name'], 'Lead')
+
+    def test_deletes_change_the_etag(self):
+        other = Event.objects.create(name='Workshop', date='2025-08-01', location='LHC', created_by=self.user)
+        url = reverse('events:event-list-create')
+        etag = self.client.get(url)['ETag']
+        Event.objects.filter(pk=other.pk).delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_object_is_still_404(self):
+        response = self.client.get(reverse('events:event-detail', args=[999]), HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, 404)
+
+
+class KeysetPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='member', email='member@example.com', name='Member')
+        # Few distinct dates, so pages have to break ties on id.
+        Event.objects.bulk_create(
+            Event(name=f'Event {i}', date=f'2025-0{1 + i % 3}-01', location='LHC', created_by=cls.user)
+            for i in range(45)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('events:event-list-create')
+
+    def test_page_numbers_remain_the_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_walks_every_row_once_in_order(self):
+        expected = list(Event.objects.order_by('-date', 'id').values_list('id', flat=True))
+
+        seen = []
+        pages = []
+        url = f'{self.url}?pagination=cursor'
+        while url:
+            # The ETag aggregate and the page itself; no COUNT(*).
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertNotIn('count', response.data)
+            pages.append(response.data)
+            seen += [event['id'] for event in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+
+        # And back again from the last page.
+        previous = self.client.get(pages[-1]['previous']).data
+        self.assertEqual(previous['results'], pages[1]['results'])
+        first = self.client.get(previous['previous']).data
+        self.assertEqual(first['results'], pages[0]['results'])
+        self.assertIsNone(first['previous'])
+
+    def test_invalid_cursor_is_404(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'garbage'}).status_code, 404)
+
+
+class JSONListFilterTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='member', email='member@example.com', name='Member')
+        for name, tags in [('A', ['ai', 'web']), ('B', ['ai']), ('C', ['web', 'cp']), ('D', [])]:
+            Event.objects.create(name=name, date='2025-09-01', location='LHC', tags=tags, created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('events:event-list-create')
+
+    def names(self, params):
+        response = self.client.get(self.url, params)
+        return sorted(event['name'] for event in response.data['results'])
+
+    def test_any(self):
+        self.assertEqual(self.names({'tags': 'ai,cp'}), ['A', 'B', 'C'])
+
+    def test_all(self):
+        self.assertEqual(self.names({'tags': 'ai,web', 'match': 'all'}), ['A'])
+
+    def test_no_filter(self):
+        self.assertEqual(self.names({}), ['A', 'B', 'C', 'D'])
+
+    def test_facets_in_one_query(self):
+        url = reverse('events:event-facets')
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data['tags'], [
+            {'value': 'ai', 'count': 2},
+            {'value': 'web', 'count': 2},
+            {'value': 'cp', 'count': 1},
+        ])
+
+    def test_facets_respect_filters(self):
+        response = self.client.get(reverse('events:event-facets'), {'tags': 'cp'})
+        self.assertEqual(response.data['tags'], [{'value': 'cp', 'count': 1}, {'value': 'web', 'count': 1}])
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_VARIANT_WIDTHS=[160, 320, 640])
+class ImageVariantTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='member', email='member@example.com', name='Member')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, width, height, mode='RGB'):
+        image = PILImage.new(mode, (width, height), 'red')
+        exif = PILImage.Exif()
+        exif[0x010F] = 'Camera maker'
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG' if mode == 'RGB' else 'PNG', exif=exif)
+        return SimpleUploadedFile('photo.jpg' if mode == 'RGB' else 'photo.png', buffer.getvalue())
+
+    def test_variants_are_generated_on_upload(self):
+        project = Project.objects.create(
+            name='Website', description_short='Short', created_by=self.user, image=self.upload(1000, 500),
+        )
+        self.assertEqual(project.image_variants['source'], project.image.name)
+        self.assertEqual(list(project.image_variants['webp']), ['160', '320', '640'])
+
+        name = project.image_variants['jpeg']['320']
+        with default_storage.open(name) as variant, PILImage.open(variant) as image:
+            self.assertEqual(image.size, (320, 160))
+            self.assertEqual(len(image.getexif()), 0)
+
+        response = self.client.get(reverse('projects:project-detail', args=[project.pk]))
+        self.assertIn(' 640w', response.data['image_srcset']['webp'])
+        self.assertTrue(response.data['image_srcset']['jpeg'].startswith('http://testserver/media/variants/'))
+
+    def test_small_and_transparent_images(self):
+        self.user.profile_pic = self.upload(100, 100, mode='RGBA')
+        self.user.save()
+        self.assertEqual(list(self.user.profile_pic_variants['jpeg']), ['100'])
+
+    def test_identical_uploads_share_variants(self):
+        first = Project.objects.create(name='A', description_short='Short', created_by=self.user, image=self.upload(400, 400))
+        second = Project.objects.create(name='B', description_short='Short', created_by=self.user, image=self.upload(400, 400))
+        self.assertNotEqual(first.image.name, second.image.name)
+        self.assertEqual(first.image_variants['webp'], second.image_variants['webp'])
+
+    def test_removing_the_image_clears_variants(self):
+        project = Project.objects.create(name='A', description_short='Short', created_by=self.user, image=self.upload(400, 400))
+        project.image = ''
+        project.save()
+        project.refresh_from_db()
+        self.assertEqual(project.image_variants, {})
+
+    def test_backfill_command(self):
+        project = Project.objects.create(name='A', description_short='Short', created_by=self.user, image=self.upload(400, 400))
+        Project.objects.filter(pk=project.pk).update(image_variants={})
+        url = reverse('projects:project-detail', args=[project.pk])
+        etag = self.client.get(url)['ETag']
+        call_command('generate_image_variants', stdout=StringIO())
+        project.refresh_from_db()
+        self.assertEqual(list(project.image_variants['webp']), ['160', '320'])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(' 320w', response.data['image_srcset']['webp'])
+
+    def test_undecodable_images_are_saved_without_variants(self):
+        image = SimpleUploadedFile('photo.jpg', b'not an image')
+        with self.assertLogs('core.signals', 'ERROR'):
+            project = Project.objects.create(name='A', description_short='Short', created_by=self.user, image=image)
+        project.refresh_from_db()
+        self.assertEqual(project.image_variants, {})
+
+
+class SparseFieldsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Member', can_manage_events=True)
+        domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='member', email='member@example.com', name='Member', role=role, domain=domain,
+            skills=['python'],
+        )
+        for i in range(5):
+            creator = User.objects.create_user(
+                username=f'creator{i}', email=f'creator{i}@example.com', name=f'Creator {i}', role=role, domain=domain,
+            )
+            Event.objects.create(name=f'Event {i}', date='2025-09-01', location='LHC', created_by=creator)
+            project = Project.objects.create(name=f'Project {i}', description_short='Short', created_by=creator)
+            project.domains.set([domain])
+            project.set_team_members([cls.user.pk])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response, ' '.join(query['sql'] for query in queries)
+
+    def test_nested_fields(self):
+        response, sql = self.get(reverse('events:event-list-create'), {'fields': 'id,name,created_by_data.name'})
+        event = Event.objects.get(name='Event 0')
+        self.assertEqual(response.data['results'][0], {'id': event.pk, 'name': 'Event 0', 'created_by_data': {'name': 'Creator 0'}})
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"skills"', sql)
+        self.assertNotIn('"roles"', sql)
+
+    def test_unselected_relations_are_not_prefetched(self):
+        url = reverse('projects:project-list-create')
+        # ETag aggregate, COUNT and the page itself.
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {'fields': 'id,name'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name'})
+
+        response, sql = self.get(url, {'fields': 'id,team_members_data.user.profile_pic'})
+        member = response.data['results'][0]['team_members_data'][0]
+        self.assertEqual(member, {'user': {'profile_pic': 'http://testserver/api/users/avatars/256/Member.svg'}})
+        self.assertNotIn('description_long', sql)
+
+    def test_whole_nested_relations(self):
+        response = self.client.get(reverse('projects:project-list-create'), {'fields': 'id,domains_data'})
+        project = response.data['results'][0]
+        self.assertEqual(set(project), {'id', 'domains_data'})
+        self.assertEqual(set(project['domains_data'][0]), {'id', 'name', 'description'})
+
+    def test_expand_is_rejected(self):
+        for params in [{'expand': 'domains_data'}, {'fields': 'id', 'expand': 'domains_data'}]:
+            response = self.client.get(reverse('projects:project-list-create'), params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_full_responses_skip_the_search_vector(self):
+        response, sql = self.get(reverse('users:user-detail', args=[self.user.pk]), {})
+        self.assertIn('skills', response.data)
+        self.assertNotIn('search_vector', sql)
+
+    def test_nested_user_relations_are_joined(self):
+        url = reverse('events:event-list-create')
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.data['results'][0]['created_by_data']['role_name'], 'Member')
+
+    def test_invalid_fields(self):
+        for fields in ['id,nope', 'name.first', 'created_by_data.nope']:
+            response = self.client.get(reverse('events:event-list-create'), {'fields': fields})
+            self.assertEqual(response.status_code, 400, fields)
+
+    def test_writes_return_every_field(self):
+        response = self.client.post(reverse('events:event-list-create') + '?fields=id', {
+            'name': 'Hackathon', 'date': '2025-09-01', 'location': 'LHC',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertIn('created_by_data', response.data)
+
+
+class NormalizedResponseTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Officer')
+        cls.domain = Domain.objects.create(name='Web Development')
+        cls.officer = User.objects.create_user(
+            username='officer', email='officer@example.com', name='Officer', role=cls.role, domain=cls.domain,
+        )
+        cls.member = User.objects.create_user(username='member', email='member@example.com', name='Member')
+        for i in range(3):
+            project = Project.objects.create(name=f'Project {i}', description_short='Short', created_by=cls.officer)
+            project.domains.set([cls.domain])
+            project.set_team_members([cls.officer.pk, cls.member.pk])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.member)
+
+    def test_projects(self):
+        url = reverse('projects:project-list-create')
+        # Same queries as the embedded format: ETag aggregate, COUNT, page,
+        # domains and team members.
+        with self.assertNumQueries(5):
+            response = self.client.get(url, {'normalize': '1'})
+        project = response.data['results'][0]
+        self.assertEqual(project['created_by_data'], self.officer.pk)
+        self.assertEqual(project['domains_data'], [self.domain.pk])
+        self.assertEqual(
+            sorted(member['user'] for member in project['team_members_data']), [self.officer.pk, self.member.pk],
+        )
+
+        included = response.data['included']
+        self.assertEqual(set(included['users']), {self.officer.pk, self.member.pk})
+        officer = included['users'][self.officer.pk]
+        self.assertEqual(officer['role'], self.role.pk)
+        self.assertNotIn('role_name', officer)
+        self.assertEqual(included['roles'], {self.role.pk: {'id': self.role.pk, 'name': 'Officer',
+                                                           'can_manage_events': False, 'can_manage_projects': False}})
+        self.assertEqual(set(included['domains']), {self.domain.pk})
+
+    def test_cached_responses_keep_the_included_map(self):
+        url = reverse('projects:project-list-create')
+        first = self.client.get(url, {'normalize': '1'}).json()
+        second = self.client.get(url, {'normalize': '1'}).json()
+        self.assertEqual(get_stats()['hits'], 1)
+        self.assertEqual(first, second)
+        self.assertIn(str(self.officer.pk), second['included']['users'])
+
+    def test_with_sparse_fields(self):
+        response = self.client.get(reverse('events:event-list-create'), {'normalize': 'true'})
+        self.assertEqual(response.data['included'], {})
+
+        response = self.client.get(reverse('projects:project-list-create'), {
+            'normalize': '1', 'fields': 'id,created_by_data.name,team_members_data.user.email',
+        })
+        self.assertEqual(response.data['included']['users'][self.officer.pk],
+                         {'name': 'Officer', 'email': 'officer@example.com'})
+
+    def test_default_format_is_unchanged(self):
+        response = self.client.get(reverse('projects:project-list-create'))
+        self.assertNotIn('included', response.data)
+        self.assertEqual(response.data['results'][0]['created_by_data']['role_name'], 'Officer')
+
+
+class CompiledSerializerTests(APITestCase):
+    """The compiled read path must render exactly what the serializers do."""
+
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Officer', can_manage_projects=True)
+        domains = [Domain.objects.create(name=name) for name in ['Web Development', 'AI/ML', 'Competitive Programming']]
+        cls.user = User.objects.create_user(
+            username='officer', email='officer@example.com', name='Åsa Öberg', role=role, domain=domains[0],
+            skills=['python', 'django'], github_link='https://github.com/officer',
+        )
+        User.objects.filter(pk=cls.user.pk).update(
+            profile_pic='profile_pics/officer.jpg',
+            profile_pic_variants={
+                'source': 'profile_pics/officer.jpg',
+                'webp': {'160': 'variants/abc-160.webp'}, 'jpeg': {'160': 'variants/abc-160.jpg'},
+            },
+        )
+        members = [
+            User.objects.create_user(username=f'member{i}', email=f'member{i}@example.com', name=name, batch='2026')
+            for i, name in enumerate(['Member', 'single', 'Mx "Quoted" Name'])
+        ]
+        for i in range(7):
+            Event.objects.create(
+                name=f'Event {i}', date=f'2025-09-0{i + 1}', location='LHC', description='' if i % 2 else 'Details',
+                tags=['ai', 'web'][:i % 3], created_by=members[i % 3] if i % 2 else cls.user,
+            )
+            project = Project.objects.create(
+                name=f'Project {i}', description_short='Short', description_long='Long ' * i,
+                tech_stack=['react'] if i % 2 else [], status='in_progress' if i % 2 else 'completed',
+                created_by=cls.user if i % 3 else members[0],
+            )
+            if i % 2 == 0:
+                Project.objects.filter(pk=project.pk).update(image=f'project_images/{i}.png')
+            project.domains.set(domains[:i % 4])
+            project.set_team_members([member.pk for member in members[:i % 4]])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def assertConforms(self, url, params=None):
+        bodies = []
+        for compiled in (False, True):
+            cache.clear()
+            view_class = self.client.get(url, params).renderer_context['view'].__class__
+            view_class.use_compiled_serializer = compiled
+            try:
+                cache.clear()
+                response = self.client.get(url, params)
+            finally:
+                view_class.use_compiled_serializer = True
+            self.assertEqual(response.status_code, 200, response.content)
+            bodies.append(response.content)
+        self.assertEqual(bodies[0], bodies[1])
+        return bodies[1]
+
+    def test_lists(self):
+        for serializer_class in [EventSerializer, ProjectSerializer, UserSerializer]:
+            self.assertIsNotNone(compile_serializer(serializer_class))
+        for name in ['events:event-list-create', 'projects:project-list-create', 'users:user-list']:
+            with self.subTest(name):
+                self.assertConforms(reverse(name))
+
+    def test_selections_share_compiled_serializers(self):
+        selection = parse_selection('id,name,created_by_data.name,created_by_data.id')
+        reordered = parse_selection('created_by_data.id,name,created_by_data.name,id')
+        self.assertIs(compile_serializer(EventSerializer, selection), compile_serializer(EventSerializer, reordered))
+        self.assertLessEqual(_compile.cache_info().currsize, COMPILED_CACHE_SIZE)
+
+    @mock.patch.object(KeysetPagination, 'page_size', 3)
+    def test_pages_and_cursors(self):
+        url = reverse('projects:project-list-create')
+        self.assertConforms(url, {'page': 2})
+        first = json.loads(self.assertConforms(url, {'pagination': 'cursor'}))
+        second = json.loads(self.assertConforms(first['next']))
+        self.assertConforms(second['previous'])
+
+    def test_filters_and_sparse_fields(self):
+        self.assertConforms(reverse('events:event-list-create'), {'tags': 'ai', 'fields': 'id,created_by_data.name'})
+        self.assertConforms(reverse('projects:project-list-create'), {
+            'fields': 'id,image,team_members_data.user.profile_pic,domains_data.name',
+        })
+        self.assertConforms(reverse('users:user-list'), {'fields': 'profile_pic,role_name', 'skills': 'python'})
+
+    def test_same_queries(self):
+        url = reverse('projects:project-list-create')
+        # ETag aggregate, COUNT, page, domains and team members, either way.
+        with self.assertNumQueries(5):
+            self.client.get(url)
+        cache.clear()
+        ProjectListCreateView.use_compiled_serializer = False
+        try:
+            with self.assertNumQueries(5):
+                self.client.get(url)
+        finally:
+            ProjectListCreateView.use_compiled_serializer = True
+
+
+class RendererTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='member', email='member@example.com', name='Zoë', role=role, domain=domain,
+        )
+        Event.objects.create(name='Hackathon', date='2025-09-01', location='LHC', tags=['ai'], created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('events:event-list-create')
+
+    def test_same_bytes_as_drf(self):
+        data = {
+            'text': 'Zoë\u2028line',
+            'when': datetime.datetime(2025, 9, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'offset': datetime.datetime(2025, 9, 1, 10, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=5, minutes=30))),
+            'day': datetime.date(2025, 9, 1),
+            'amount': decimal.Decimal('1.50'),
+            'lazy': gettext_lazy('Invalid cursor'),
+            'nested': [{'tags': ['ai', 'web'], 'none': None, 'flag': True}],
+            1: 'int key',
+        }
+        expected = JSONRenderer().render(data)
+        self.assertEqual(FastJSONRenderer().render(data), expected)
+        with mock.patch('core.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(data), expected)
+
+    def test_api_responses_match(self):
+        fast = self.client.get(self.url).content
+        with mock.patch('core.renderers.orjson', None):
+            cache.clear()
+            self.assertEqual(self.client.get(self.url).content, fast)
+
+    @skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack(self):
+        json_response = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), json.loads(json_response.content))
+        self.assertNotEqual(response['ETag'], json_response['ETag'])
+        self.assertIn('Accept', response['Vary'])
+
+        response = self.client.post(
+            self.url, msgpack.packb({'name': 'Workshop', 'date': '2025-10-01', 'location': 'LHC'}),
+            content_type='application/msgpack',
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_invalid_json(self):
+        response = self.client.post(self.url, '{"name": ', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class CompressionTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='member', email='member@example.com', name='Member', role=role, domain=domain,
+        )
+        Event.objects.bulk_create([
+            Event(name=f'Event {i}', date='2025-09-01', location='LHC', description='Details ' * 20,
+                  tags=['ai'], created_by=cls.user)
+            for i in range(10)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('events:event-list-create')
+
+    def test_gzip(self):
+        plain = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(response['ETag'], 'W/' + plain['ETag'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    @skipIf(brotli is None, 'brotli is not installed')
+    def test_brotli_preferred(self):
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_negotiation(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertNotIn('Content-Encoding', response)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='*')
+        self.assertIn(response['Content-Encoding'], ('br', 'gzip'))
+
+    def test_small_responses_are_not_compressed(self):
+        with override_settings(COMPRESSION_MIN_SIZE=10 ** 6):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_cache_hits_reuse_compressed_bytes(self):
+        with mock.patch.object(CompressionMiddleware, 'compress', autospec=True,
+                               side_effect=CompressionMiddleware.compress) as compress:
+            first = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+            second = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(compress.call_count, 1)
+            self.assertEqual(second.content, first.content)
+
+            # A new representation of the list is compressed again.
+            self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_ACCEPT='application/json; indent=2')
+            self.assertEqual(compress.call_count, 2)
+
+    # The manifest storage needs collectstatic for the browsable API's assets.
+    @override_settings(STORAGES={
+        **settings.STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+    def test_browsable_api_is_compressed_per_request(self):
+        other = User.objects.create_user(username='other', email='other@example.com', name='Other')
+        bodies = []
+        for user in [self.user, other]:
+            self.client.force_authenticate(user)
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_ACCEPT='text/html')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            bodies.append(gzip.decompress(response.content).decode())
+        self.assertIn(f'<li class="navbar-text">{self.user}</li>', bodies[0])
+        self.assertIn(f'<li class="navbar-text">{other}</li>', bodies[1])
+
+        # Anonymous visitors each get their own CSRF token.
+        self.client.force_authenticate(None)
+        tokens = []
+        for token in ['a' * 32, 'b' * 32]:
+            self.client.cookies['csrftoken'] = token
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_ACCEPT='text/html')
+            body = gzip.decompress(response.content).decode()
+            tokens.append(re.search(r'"csrfToken": "(\w+)"', body).group(1))
+        self.assertNotEqual(tokens[0], tokens[1])
+
+
+class PublicReadTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='member', email='member@example.com', name='Member', role=role, domain=domain,
+        )
+        cls.event = Event.objects.create(
+            name='Hackathon', date='2025-09-01', location='LHC', tags=['ai'], created_by=cls.user,
+        )
+        project = Project.objects.create(name='Website', description_short='Short', created_by=cls.user)
+        project.domains.set([domain])
+        project.set_team_members([cls.user.pk])
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('events:event-list-create')
+
+    def test_anonymous_reads_public_fields(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        event = response.json()['results'][0]
+        self.assertNotIn('created_by', event)
+        self.assertEqual(event['created_by_data']['name'], 'Member')
+        self.assertNotIn('email', event['created_by_data'])
+
+        response = self.client.get(reverse('projects:project-list-create'))
+        project = response.json()['results'][0]
+        self.assertEqual(project['domains_data'][0]['name'], 'Web Development')
+        self.assertEqual(set(project['team_members_data'][0]), {'user', 'role_in_project'})
+        self.assertNotIn('email', project['team_members_data'][0]['user'])
+        self.assertNotIn('username', project['created_by_data'])
+
+        # ?fields= can narrow the public fields but not widen them.
+        response = self.client.get(self.url, {'fields': 'name,created_by_data.email'})
+        self.assertEqual(response.json()['results'][0], {'name': 'Hackathon', 'created_by_data': {}})
+
+    def test_cache_headers(self):
+        public = self.client.get(self.url)
+        self.assertIn('public', public['Cache-Control'])
+        self.assertIn(f's-maxage={settings.PUBLIC_READ_S_MAXAGE}', public['Cache-Control'])
+        self.assertNotIn('private', public['Cache-Control'])
+        self.assertIn('Authorization', public['Vary'])
+        self.assertIn('Accept', public['Vary'])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=public['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('public', response['Cache-Control'])
+
+        self.client.force_authenticate(self.user)
+        private = self.client.get(self.url)
+        self.assertIn('private', private['Cache-Control'])
+        self.assertNotIn('s-maxage', private['Cache-Control'])
+        self.assertIn('Authorization', private['Vary'])
+        self.assertNotEqual(private['ETag'], public['ETag'])
+        self.assertIn('email', private.json()['results'][0]['created_by_data'])
+
+    def test_writes_still_need_authentication(self):
+        response = self.client.post(self.url, {'name': 'Workshop', 'date': '2025-10-01', 'location': 'LHC'})
+        self.assertEqual(response.status_code, 401)
+        response = self.client.delete(reverse('events:event-detail', args=[self.event.pk]))
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(PUBLIC_READ_ENABLED=False)
+    def test_disabled(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.assertEqual(self.client.get(reverse('projects:project-list-create')).status_code, 401)
+
+
+@override_settings(SNAPSHOT_DIR=tempfile.mkdtemp())
+class SnapshotTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.SNAPSHOT_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        cls.domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='member', email='member@example.com', name='Member', role=role, domain=cls.domain,
+        )
+        Event.objects.create(name='Hackathon', date='2025-09-01', location='LHC', tags=['ai'], created_by=cls.user)
+
+    def setUp(self):
+        shutil.rmtree(settings.SNAPSHOT_DIR, ignore_errors=True)
+
+    def load(self, name, suffix=''):
+        entry = read_manifest()[name]
+        with open(f"{settings.SNAPSHOT_DIR}/{entry['file']}{suffix}", 'rb') as f:
+            return f.read()
+
+    def test_export(self):
+        out = StringIO()
+        call_command('export_snapshots', stdout=out)
+        self.assertIn('events: written', out.getvalue())
+        self.assertEqual(set(read_manifest()), {'events', 'projects', 'team', 'domains'})
+
+        events = json.loads(self.load('events'))
+        self.assertEqual(events['count'], 1)
+        self.assertEqual(events['results'][0]['created_by_data']['name'], 'Member')
+        self.assertNotIn('email', events['results'][0]['created_by_data'])
+        self.assertNotIn('email', json.loads(self.load('team'))['results'][0])
+        self.assertEqual(gzip.decompress(self.load('events', '.gz')), self.load('events'))
+        if brotli is not None:
+            self.assertEqual(brotli.decompress(self.load('events', '.br')), self.load('events'))
+
+        # Nothing changed, so nothing is rewritten.
+        out = StringIO()
+        call_command('export_snapshots', stdout=out)
+        self.assertNotIn('written', out.getvalue())
+
+    def test_only_changed_datasets_are_written(self):
+        call_command('export_snapshots', stdout=StringIO())
+        before = read_manifest()
+        old_events = self.load('events')
+
+        with override_settings(SNAPSHOT_EXPORT_ON_WRITE=True), self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(name='Workshop', date='2025-10-01', location='LHC', created_by=self.user)
+        after = read_manifest()
+        self.assertEqual(json.loads(self.load('events'))['count'], 2)
+        self.assertNotEqual(after['events']['version'], before['events']['version'])
+        for name in ['projects', 'team', 'domains']:
+            self.assertEqual(after[name], before[name])
+
+        # The previous version stays available to clients with the old manifest.
+        with open(f"{settings.SNAPSHOT_DIR}/{before['events']['file']}", 'rb') as f:
+            self.assertEqual(f.read(), old_events)
+
+    def test_unknown_dataset(self):
+        with self.assertRaises(CommandError):
+            call_command('export_snapshots', 'members', stdout=StringIO())
+
+
+class StatsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        web = Domain.objects.create(name='Web Development')
+        Domain.objects.create(name='Machine Learning')
+        cls.user = User.objects.create_user(
+            username='member', email='member@example.com', name='Member', role=cls.role, domain=web, batch='2026',
+        )
+        User.objects.create_user(username='guest', email='guest@example.com', name='Guest', batch='2027')
+        User.objects.create_user(username='alumnus', email='alumnus@example.com', name='Alumnus', is_active=False)
+        for name, status in [('Website', 'in_progress'), ('App', 'completed'), ('Bot', 'completed')]:
+            Project.objects.create(name=name, description_short='Short', status=status, created_by=cls.user).domains.set([web])
+        for date in ['2025-09-01', '2025-09-20', '2025-10-05']:
+            Event.objects.create(name='Meetup', date=date, location='LHC', created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('core:stats')
+
+    def test_stats(self):
+        with self.assertNumQueries(6):
+            stats = self.client.get(self.url).json()
+        self.assertEqual(stats['totals'], {'projects': 3, 'members': 2, 'events': 3, 'domains': 2})
+        self.assertEqual(
+            [(row['status'], row['count']) for row in stats['projects_by_status']],
+            [('in_progress', 1), ('completed', 2)],
+        )
+        self.assertEqual(
+            [(row['name'], row['count']) for row in stats['projects_by_domain']],
+            [('Machine Learning', 0), ('Web Development', 3)],
+        )
+        self.assertCountEqual(
+            [(row['name'], row['count']) for row in stats['members_by_role']], [(None, 1), ('Coordinator', 1)],
+        )
+        self.assertEqual(stats['members_by_batch'], [{'batch': '2026', 'count': 1}, {'batch': '2027', 'count': 1}])
+        self.assertEqual(stats['events_by_month'], [{'month': '2025-09', 'count': 2}, {'month': '2025-10', 'count': 1}])
+
+    def test_cached_until_a_write(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertIn('s-maxage', response['Cache-Control'])
+
+        Event.objects.create(name='Workshop', date='2025-11-01', location='LHC', created_by=self.user)
+        with self.assertNumQueries(6):
+            stats = self.client.get(self.url).json()
+        self.assertEqual(stats['totals']['events'], 4)
+
+    @override_settings(PUBLIC_READ_ENABLED=False)
+    def test_private_when_public_reads_are_off(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.client.force_authenticate(self.user)
+        self.assertIn('private', self.client.get(self.url)['Cache-Control'])
+
+
+class AsyncReadViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Coordinator', can_manage_events=True, can_manage_projects=True)
+        domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='member', email='member@example.com', name='Member', role=role, domain=domain,
+        )
+        for i in range(5):
+            Event.objects.create(name=f'Event {i}', date=f'2025-09-0{i + 1}', location='LHC', created_by=cls.user)
+            project = Project.objects.create(name=f'Project {i}', description_short='Short', created_by=cls.user)
+            project.domains.set([domain])
+            project.set_team_members([cls.user.pk])
+        cls.event = Event.objects.first()
+        cls.project = Project.objects.first()
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+
+    def get(self, view, path, user=None, async_view=True, **kwargs):
+        request = self.factory.get(path, **kwargs.pop('headers', {}))
+        if user is not None:
+            force_authenticate(request, user)
+        if async_view:
+            response = async_to_sync(view.as_async_view())(request, **kwargs)
+        else:
+            response = view.as_view()(request, **kwargs)
+        return response.render() if hasattr(response, 'render') else response
+
+    def assertSameResponse(self, view, path, user=None, **kwargs):
+        expected = self.get(view, path, user, async_view=False, **kwargs)
+        cache.clear()
+        response = self.get(view, path, user, **kwargs)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response['Cache-Control'], expected['Cache-Control'])
+        return response
+
+    def test_same_responses_as_sync_views(self):
+        cases = [
+            (EventListCreateView, '/api/events/', {}),
+            (EventListCreateView, '/api/events/?fields=id,name,created_by_data', {}),
+            (EventListCreateView, '/api/events/?normalize=1', {}),
+            (EventListCreateView, '/api/events/?pagination=cursor', {}),
+            (EventDetailView, f'/api/events/{self.event.pk}/', {'pk': self.event.pk}),
+            (ProjectListCreateView, '/api/projects/', {}),
+            (ProjectDetailView, f'/api/projects/{self.project.pk}/', {'pk': self.project.pk}),
+            (UserListView, '/api/users/list/', {}),
+            (UserDetailView, f'/api/users/{self.user.pk}/', {'pk': self.user.pk}),
+            (DomainListView, '/api/users/domains/', {}),
+            (RoleListView, '/api/users/roles/', {}),
+        ]
+        for view, path, kwargs in cases:
+            with self.subTest(path):
+                self.assertSameResponse(view, path, self.user, **kwargs)
+        # Anonymous public reads.
+        self.assertSameResponse(EventListCreateView, '/api/events/')
+        self.assertSameResponse(ProjectDetailView, f'/api/projects/{self.project.pk}/', pk=self.project.pk)
+
+    @mock.patch.object(KeysetPagination, 'page_size', 2)
+    def test_pages(self):
+        response = self.assertSameResponse(EventListCreateView, '/api/events/?page=2', self.user)
+        self.assertEqual(response.data['count'], 5)
+        response = self.assertSameResponse(EventListCreateView, '/api/events/?pagination=cursor', self.user)
+        next_url = response.data['next']
+        self.assertSameResponse(EventListCreateView, next_url, self.user)
+        self.assertEqual(self.get(EventListCreateView, '/api/events/?page=9', self.user).status_code, 404)
+
+    def test_cache_and_conditional_get(self):
+        first = self.get(EventListCreateView, '/api/events/', self.user)
+        with self.assertNumQueries(1):
+            second = self.get(EventListCreateView, '/api/events/', self.user)
+        self.assertEqual(second.content, first.content)
+
+        response = self.get(EventListCreateView, '/api/events/', self.user, headers={'HTTP_IF_NONE_MATCH': first['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_errors(self):
+        self.assertEqual(self.get(UserListView, '/api/users/list/').status_code, 401)
+        self.assertEqual(self.get(EventDetailView, '/api/events/0/', self.user, pk=0).status_code, 404)
+        self.assertEqual(self.get(EventListCreateView, '/api/events/?fields=nope', self.user).status_code, 400)
+
+    def test_writes_use_the_sync_view(self):
+        request = self.factory.post('/api/events/', {'name': 'Workshop', 'date': '2025-10-01', 'location': 'LHC'})
+        force_authenticate(request, self.user)
+        response = async_to_sync(EventListCreateView.as_async_view())(request)
+        self.assertEqual(response.status_code, 201)
+
+
+REPLICA = 'replica'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], DATABASE_REPLICA_LAG=5)
+class ReplicaRoutingTests(APITestCase):
+    """
+    The primary is the test database; the replica is a second, SQLite, database
+    with its own rows, so each response shows which one it was read from.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Added here rather than in settings, so only this test case knows it.
+        cls.replica_dir = tempfile.mkdtemp()
+        connections.settings[REPLICA] = connections.configure_settings({
+            'default': connections.settings['default'],
+            REPLICA: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': f'{cls.replica_dir}/replica.sqlite3'},
+        })[REPLICA]
+        call_command('migrate', database=REPLICA, verbosity=0)
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        shutil.rmtree(cls.replica_dir)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        cls.domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='member', email='member@example.com', name='Member', role=cls.role, domain=cls.domain,
+        )
+        Event.objects.create(name='On the primary', date='2025-09-01', location='LHC', created_by=cls.user)
+
+        # full_clean()'s checks read from the primary, so reuse its ids for the
+        # foreign keys and other names for the unique fields.
+        role = Role.objects.using(REPLICA).create(pk=cls.role.pk, name='Coordinator', can_manage_events=True)
+        domain = Domain.objects.using(REPLICA).create(pk=cls.domain.pk, name='Web Development')
+        user = User.objects.db_manager(REPLICA).create_user(
+            username='replica-member', email='replica-member@example.com', name='Member', role=role, domain=domain,
+        )
+        Event.objects.using(REPLICA).create(name='On the replica', date='2025-09-01', location='LHC', created_by=user)
+
+    def setUp(self):
+        # Also drops the pin setUpTestData's writes left.
+        cache.clear()
+        self.url = reverse('events:event-list-create')
+
+    def names(self, response):
+        return [event['name'] for event in response.json()['results']]
+
+    def test_reads_go_to_the_replica(self):
+        self.assertEqual(self.names(self.client.get(self.url)), ['On the replica'])
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.names(self.client.get(self.url)), ['On the replica'])
+
+    def test_other_views_read_from_the_primary(self):
+        self.assertEqual(self.client.get(reverse('core:stats')).json()['totals']['events'], 1)
+        self.assertFalse(Event.objects.filter(name='On the replica').exists())
+
+    def test_reads_go_to_the_primary_after_a_write(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(self.url, {'name': 'Workshop', 'date': '2025-10-01', 'location': 'LHC'}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        # Another reader, within the lag window.
+        self.client.force_authenticate(None)
+        self.assertCountEqual(self.names(self.client.get(self.url)), ['On the primary', 'Workshop'])
+
+        # The window is over (and, here, the cached response gone).
+        cache.clear()
+        self.assertEqual(self.names(self.client.get(self.url)), ['On the replica'])
+
+    def test_reads_after_a_write_in_the_same_request(self):
+        router = db_router.ReplicaRouter()
+        token = db_router.start_request()
+        try:
+            db_router.use_replica()
+            self.assertEqual(router.db_for_read(Event), REPLICA)
+            self.assertEqual(router.db_for_write(Event), 'default')
+            self.assertEqual(router.db_for_read(Event), 'default')
+        finally:
+            db_router.end_request(token)
+        self.assertTrue(db_router.is_pinned())
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        self.assertEqual(self.names(self.client.get(self.url)), ['On the primary'])
+
+
+class RequestTimingTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        cls.domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='member', email='member@example.com', name='Member', role=cls.role, domain=cls.domain,
+        )
+        for name in ['Meetup', 'Workshop']:
+            Event.objects.create(name=name, date='2025-09-01', location='LHC', created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def server_timing(self, response):
+        metrics = {}
+        for metric in response['Server-Timing'].split(', '):
+            name, *params = metric.split(';')
+            metrics[name] = dict(param.split('=', 1) for param in params)
+        return metrics
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1, REQUEST_TIMING_HEADER=True)
+    def test_server_timing_and_log_line(self):
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            response = self.client.get(reverse('events:event-list-create'))
+        metrics = self.server_timing(response)
+        self.assertEqual(set(metrics), {'total', 'db', 'serialize', 'render'})
+        self.assertGreater(float(metrics['serialize']['dur']) + float(metrics['render']['dur']), 0)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'events:event-list-create')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertEqual(record['duplicate_queries'], 0)
+        self.assertEqual(metrics['db']['desc'], f'"{record["queries"]} queries (0 duplicates)"')
+        self.assertGreaterEqual(record['total_ms'], record['db_ms'])
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1, REQUEST_TIMING_HEADER=True)
+    def test_serializer_time_for_drf_serializers(self):
+        with self.assertLogs('core.timing', 'INFO'):
+            response = self.client.get(reverse('events:event-detail', args=[Event.objects.first().pk]))
+        self.assertGreater(float(self.server_timing(response)['serialize']['dur']), 0)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1, REQUEST_TIMING_HEADER=True, REQUEST_TIMING_DUPLICATE_THRESHOLD=3)
+    def test_repeated_queries_are_reported(self):
+        def view(request):
+            for event in Event.objects.all():
+                event.created_by  # Not select_related: one query per event.
+            User.objects.get(pk=self.user.pk)
+            return HttpResponse()
+
+        with self.assertLogs('core.timing', 'WARNING') as logs:
+            response = RequestTimingMiddleware(view)(APIRequestFactory().get('/'))
+        self.assertIn('desc="4 queries (2 duplicates)"', response['Server-Timing'])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['duplicate_queries'], 2)
+        self.assertEqual(record['most_repeated']['count'], 3)
+        self.assertTrue(record['most_repeated']['sql'].startswith('SELECT "users"."id"'))
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1, REQUEST_TIMING_HEADER=False)
+    def test_header_only_for_staff(self):
+        url = reverse('events:event-list-create')
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            self.assertNotIn('Server-Timing', self.client.get(url))
+            self.client.force_authenticate(None)
+            self.assertNotIn('Server-Timing', self.client.get(url))
+            staff = User.objects.create_user(username='staff', email='staff@example.com', name='Staff')
+            User.objects.filter(pk=staff.pk).update(is_staff=True)
+            self.client.force_authenticate(User.objects.get(pk=staff.pk))
+            self.assertIn('Server-Timing', self.client.get(url))
+        self.assertEqual(len(logs.records), 3)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled(self):
+        with self.assertNoLogs('core.timing'):
+            response = self.client.get(reverse('events:event-list-create'))
+        self.assertNotIn('Server-Timing', response)
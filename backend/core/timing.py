@@ -0,0 +1,181 @@
+# core/timing.py
+"""
+Per-request timings.
+
+RequestTimingMiddleware samples REQUEST_TIMING_SAMPLE_RATE of requests and,
+for those, records the number and total time of SQL queries, how many of
+them repeated a statement already run (an N+1 shows as one statement run
+once per row), the time spent serializing and rendering, and the total wall
+time. They go out as one JSON log line on the `core.timing` logger, a
+warning when a statement ran REQUEST_TIMING_DUPLICATE_THRESHOLD times or
+more, and, to staff or everyone when REQUEST_TIMING_HEADER is set, as a
+Server-Timing header, which browser devtools show.
+
+Unsampled requests pay for a context variable lookup per query, serializer
+and renderer call.
+"""
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.total = None
+        self.sql_time = 0.0
+        self.statements = Counter()
+        self.phases = {'serialize': 0.0, 'render': 0.0}
+        self.active = set()
+
+    @property
+    def queries(self):
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self):
+        return self.queries - len(self.statements)
+
+    def finish(self):
+        self.total = time.perf_counter() - self.start
+
+    def header(self):
+        """The Server-Timing header value."""
+        return ', '.join([
+            f'total;dur={self.total * 1000:.1f}',
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.queries} queries ({self.duplicates} duplicates)"',
+            *(f'{phase};dur={duration * 1000:.1f}' for phase, duration in self.phases.items()),
+        ])
+
+    def record(self, request, response):
+        """The log line's fields."""
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'status': response.status_code,
+            'total_ms': round(self.total * 1000, 1),
+            'db_ms': round(self.sql_time * 1000, 1),
+            'queries': self.queries,
+            'duplicate_queries': self.duplicates,
+            **{f'{phase}_ms': round(duration * 1000, 1) for phase, duration in self.phases.items()},
+        }
+        if self.duplicates:
+            sql, count = self.statements.most_common(1)[0]
+            record['most_repeated'] = {'sql': sql[:300], 'count': count}
+        return record
+
+
+def query_timer(execute, sql, params, many, context):
+    """Execute wrapper recording the query in the current request's timings."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.sql_time += time.perf_counter() - start
+        timings.statements[sql] += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver: time the connection's queries."""
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+@contextmanager
+def measure(phase):
+    """Add the time the block takes to `phase`, unless already inside one."""
+    timings = _current.get()
+    if timings is None or phase in timings.active:
+        yield
+        return
+    timings.active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.phases[phase] += time.perf_counter() - start
+        timings.active.discard(phase)
+
+
+class TimedSerializerMixin:
+    """Time `.data` as serialization; set Meta.list_serializer_class to TimedListSerializer for many=True."""
+
+    @property
+    def data(self):
+        with measure('serialize'):
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    pass
+
+
+class RequestTimingMiddleware:
+    """Must come first, so the total covers the other middleware."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        token = _current.set(RequestTimings())
+        try:
+            response = self.get_response(request)
+            self.report(request, response, _current.get())
+            return response
+        finally:
+            _current.reset(token)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        token = _current.set(RequestTimings())
+        try:
+            response = await self.get_response(request)
+            self.report(request, response, _current.get())
+            return response
+        finally:
+            _current.reset(token)
+
+    def sampled(self):
+        rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def show_header(self, request):
+        if settings.REQUEST_TIMING_HEADER:
+            return True
+        # Set by AuthenticationMiddleware, and by DRF once a view authenticates.
+        user = getattr(request, 'user', None)
+        return user is not None and user.is_staff
+
+    def report(self, request, response, timings):
+        timings.finish()
+        if self.show_header(request):
+            response.headers['Server-Timing'] = timings.header()
+        record = timings.record(request, response)
+        repeated = record.get('most_repeated', {}).get('count', 0)
+        level = logging.WARNING if repeated >= settings.REQUEST_TIMING_DUPLICATE_THRESHOLD else logging.INFO
+        logger.log(level, json.dumps(record), extra={'timing': record})
@@ -0,0 +1,10 @@
+# core/urls.py
+from django.urls import path
+from . import views
+
+app_name = 'core'
+
+urlpatterns = [
+    path('cache/stats/', views.cache_stats_view, name='cache-stats'),
+    path('stats/', views.StatsView.as_view(), name='stats'),
+]
@@ -0,0 +1,49 @@
+# core/views.py
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from rest_framework import generics, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import get_stats
+from .filters import json_list_facets
+from .public import PublicReadPermission, public_cache_control
+from .stats import get_dashboard_stats
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def cache_stats_view(request):
+    return Response(get_stats())
+
+
+class JSONListFacetView(generics.GenericAPIView):
+    """
+    Element counts for a JSON list column (`facet_field`) over the rows the
+    matching list view would return, so clients can build filter chips
+    without downloading the whole list.
+    """
+    facet_field = None
+    pagination_class = None
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response({self.facet_field: json_list_facets(queryset, self.facet_field)})
+
+
+class StatsView(APIView):
+    """
+    Aggregate counts for the dashboard and landing pages (core.stats). They
+    hold nothing per-user, so with PUBLIC_READ_ENABLED anyone may read them
+    and shared caches may keep them like the public event and project reads.
+    """
+    permission_classes = [PublicReadPermission]
+
+    def get(self, request, *args, **kwargs):
+        response = Response(get_dashboard_stats())
+        if settings.PUBLIC_READ_ENABLED:
+            patch_cache_control(response, **public_cache_control())
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
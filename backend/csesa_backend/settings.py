@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 import os
+import sys
 
 load_dotenv()
 
@@ -48,14 +51,20 @@ INSTALLED_APPS = [
     'corsheaders',
 
     # Your apps
+    'core',
     'users',
     'projects',
     'events',
+    'search',
 ]
 
 MIDDLEWARE = [
+    'core.timing.RequestTimingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -83,6 +92,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "csesa_backend.wsgi.application"
+ASGI_APPLICATION = "csesa_backend.asgi.application"
+
+# Serve the read endpoints from async views (core.asyncviews). Turn on when
+# running the ASGI application, e.g. `uvicorn csesa_backend.asgi:application`.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS') == 'True'
 
 
 # Database
@@ -98,6 +112,88 @@ DATABASES = {
         'PORT': os.getenv('DATABASE_PORT'),
     }
 }
+
+# Database connections. Each worker process keeps its connection open for
+# DATABASE_CONN_MAX_AGE seconds (health-checked before reuse) instead of
+# connecting and authenticating on every request. With DATABASE_POOL=True,
+# psycopg 3 and psycopg_pool installed, each worker gets a connection pool
+# instead; that is also the way to reuse connections under ASGI, where
+# persistent connections are unsafe. Pools are sized so all workers
+# (WEB_CONCURRENCY, which gunicorn also reads) together stay within
+# DATABASE_MAX_CONNECTIONS. `manage.py benchmark_connections` measures the
+# difference.
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+DATABASE_MAX_CONNECTIONS = int(os.getenv('DATABASE_MAX_CONNECTIONS', 90))
+DATABASE_POOL = (
+    os.getenv('DATABASE_POOL') == 'True'
+    and find_spec('psycopg') is not None and find_spec('psycopg_pool') is not None
+)
+if DATABASE_POOL:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', 1)),
+            'max_size': min(
+                int(os.getenv('DATABASE_POOL_MAX_SIZE', 4)),
+                max(1, DATABASE_MAX_CONNECTIONS // WEB_CONCURRENCY),
+            ),
+            # Seconds a request waits for a free connection before failing.
+            'timeout': int(os.getenv('DATABASE_POOL_TIMEOUT', 10)),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = (
+        0 if ASYNC_READ_VIEWS else int(os.getenv('DATABASE_CONN_MAX_AGE', 60))
+    )
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Read replicas. DATABASE_REPLICA_HOSTS=host1,host2 adds aliases replica1,
+# replica2, ... with the primary's settings but their own host; the list and
+# detail GETs read from them (core.db_router). For DATABASE_REPLICA_LAG
+# seconds after any write every read goes to the primary, so set it above
+# the replicas' usual lag.
+DATABASE_REPLICAS = []
+for number, host in enumerate(filter(None, os.getenv('DATABASE_REPLICA_HOSTS', '').split(',')), start=1):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+DATABASE_REPLICA_LAG = int(os.getenv('DATABASE_REPLICA_LAG', 5))
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'csesa-cache'),
+    }
+}
+
+# The response cache and ETags are invalidated through generation counters
+# kept in this cache (core/cache.py), and the read replica window is marked
+# in it (core/db_router.py); both only work when every worker process shares
+# it. locmem is per process: a write would only reach the worker that handled
+# it, and the others would serve stale lists and 304s. So with more than one
+# worker, configure a shared backend, e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and
+# CACHE_LOCATION=redis://host:6379.
+if WEB_CONCURRENCY > 1 and CACHES['default']['BACKEND'] == 'django.core.cache.backends.locmem.LocMemCache':
+    raise ImproperlyConfigured('WEB_CONCURRENCY > 1 needs a shared CACHE_BACKEND, not LocMemCache')
+
+# Cached list responses are invalidated by writes (see above); the timeout
+# only bounds how long unused entries occupy the cache.
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Anonymous visitors can read the public fields of events and projects
+# (see core.public); shared caches may keep those responses this many
+# seconds, so edits can take that long to reach them.
+PUBLIC_READ_ENABLED = os.getenv('PUBLIC_READ_ENABLED', 'True') == 'True'
+PUBLIC_READ_S_MAXAGE = int(os.getenv('PUBLIC_READ_S_MAXAGE', 60 * 5))
+
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:8000',
     'http://localhost:5173',
@@ -121,14 +217,40 @@ CORS_ALLOW_HEADERS = [
 ]
 AUTH_USER_MODEL = 'users.User'
 
+# Seconds each worker caches a role's permission flags (users.role_cache);
+# a role edit reaches the other workers within this time.
+ROLE_PERMISSIONS_CACHE_TTL = int(os.getenv('ROLE_PERMISSIONS_CACHE_TTL', 30))
+
+# Authorize API requests from the JWT claims alone instead of loading the user
+# from the database on every request.
+JWT_STATELESS_AUTH = os.getenv('JWT_STATELESS_AUTH') == 'True'
+
+# MessagePack is offered to clients that ask for it when msgpack is installed.
+MSGPACK_ENABLED = find_spec('msgpack') is not None
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.StatelessJWTAuthentication' if JWT_STATELESS_AUTH
+        else 'users.authentication.JWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_FILTER_BACKENDS': [
+        'core.filters.JSONListFilter',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        *(['core.renderers.MessagePackRenderer'] if MSGPACK_ENABLED else []),
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        *(['core.parsers.MessagePackParser'] if MSGPACK_ENABLED else []),
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
     'PAGE_SIZE': 20
 }
 
@@ -171,11 +293,65 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# WhiteNoise serves the collected static files with gzip/brotli copies made
+# at collectstatic time, under hashed names that can be cached forever.
+# Files missing from the manifest are served unhashed instead of erroring.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+WHITENOISE_MANIFEST_STRICT = False
+
+# Public datasets exported as static JSON by core.snapshots. With
+# SNAPSHOT_EXPORT_ON_WRITE they are re-exported as soon as a write commits;
+# otherwise run `manage.py export_snapshots` (e.g. from cron). The directory
+# is kept out of STATIC_ROOT, whose files WhiteNoise indexes once at startup;
+# serve it at SNAPSHOT_URL from the web server or CDN, like MEDIA_ROOT.
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(BASE_DIR, 'snapshots'))
+SNAPSHOT_URL = '/snapshots/'
+SNAPSHOT_EXPORT_ON_WRITE = os.getenv('SNAPSHOT_EXPORT_ON_WRITE') == 'True'
+
+# Responses smaller than this (bytes) are sent uncompressed.
+COMPRESSION_MIN_SIZE = 1024
+
+# Share of requests core.timing times (0 to 1), reporting SQL, serialize and
+# render time in a log line; a statement run REQUEST_TIMING_DUPLICATE_THRESHOLD
+# times in one request logs a warning. Off by default under `manage.py test`.
+# The Server-Timing header, which shows query counts and timings, only goes
+# to staff unless REQUEST_TIMING_HEADER is set (it is under DEBUG).
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv(
+    'REQUEST_TIMING_SAMPLE_RATE', 0 if sys.argv[1:2] == ['test'] else 0.01,
+))
+REQUEST_TIMING_DUPLICATE_THRESHOLD = int(os.getenv('REQUEST_TIMING_DUPLICATE_THRESHOLD', 5))
+REQUEST_TIMING_HEADER = bool(DEBUG) or os.getenv('REQUEST_TIMING_HEADER') == 'True'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 
 # Media files settings
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Widths (px) of the resized variants generated for uploaded images
+IMAGE_VARIANT_WIDTHS = [160, 320, 640, 1280]
+IMAGE_VARIANT_QUALITY = 80
+
+# Size of the initials avatar served for members without a profile picture.
+AVATAR_SIZE = 256
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -8,8 +8,11 @@ urlpatterns = [
     path('api/users/', include('users.urls')),
     path('api/projects/', include('projects.urls')),
     path('api/events/', include('events.urls')),
+    path('api/search/', include('search.urls')),
+    path('api/', include('core.urls')),
 ]
 
-# Serve media files in development
+# Serve media files and snapshots in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += static(settings.SNAPSHOT_URL, document_root=settings.SNAPSHOT_DIR)
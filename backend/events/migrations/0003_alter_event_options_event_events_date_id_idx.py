@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='event',
+            options={'ordering': ['-date', 'id']},
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-date', 'id'], name='events_date_id_idx'),
+        ),
+    ]
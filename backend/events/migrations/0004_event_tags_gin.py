@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:00
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+from core.operations import PostgresOnly
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_alter_event_options_event_events_date_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        PostgresOnly(migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='events_tags_gin'),
+        )),
+    ]
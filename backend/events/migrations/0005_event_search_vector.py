@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:04
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from core.operations import PostgresOnly
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_tags_gin'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        PostgresOnly(migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='events_search_gin'),
+        )),
+    ]
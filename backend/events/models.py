@@ -1,4 +1,6 @@
 # events/models.py
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from users.models import User
 
@@ -11,10 +13,19 @@ class Event(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='created_events')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by the search app; only used on PostgreSQL.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return f"{self.name} - {self.date}"
 
     class Meta:
         db_table = 'events'
-        ordering = ['-date']
\ No newline at end of file
+        ordering = ['-date', 'id']
+        indexes = [
+            # Serves the default ordering and keyset pagination.
+            models.Index(fields=['-date', 'id'], name='events_date_id_idx'),
+            # jsonb containment (@>, ?|) for tag filters; PostgreSQL only.
+            GinIndex(fields=['tags'], name='events_tags_gin'),
+            GinIndex(fields=['search_vector'], name='events_search_gin'),
+        ]
\ No newline at end of file
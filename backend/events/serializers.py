@@ -2,12 +2,16 @@
 from rest_framework import serializers
 from .models import Event
 from users.serializers import UserSerializer
+from core.sideload import SideloadMixin
+from core.sparse import SparseFieldsMixin
+from core.timing import TimedListSerializer, TimedSerializerMixin
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(TimedSerializerMixin, SideloadMixin, SparseFieldsMixin, serializers.ModelSerializer):
     created_by_data = UserSerializer(source='created_by', read_only=True)
 
     class Meta:
         model = Event
+        list_serializer_class = TimedListSerializer
         fields = [
             'id', 'name', 'date', 'location', 'description', 'tags',
             'created_by', 'created_by_data', 'created_at', 'updated_at'
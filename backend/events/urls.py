@@ -1,10 +1,12 @@
 # events/urls.py
 from django.urls import path
+from core.asyncviews import read_view
 from . import views
 
 app_name = 'events'
 
 urlpatterns = [
-    path('', views.EventListCreateView.as_view(), name='event-list-create'),
-    path('<int:pk>/', views.EventDetailView.as_view(), name='event-detail'),
+    path('', read_view(views.EventListCreateView), name='event-list-create'),
+    path('<int:pk>/', read_view(views.EventDetailView), name='event-detail'),
+    path('facets/', views.EventFacetView.as_view(), name='event-facets'),
 ]
\ No newline at end of file
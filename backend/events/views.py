@@ -1,27 +1,58 @@
 # events/views.py
 from rest_framework import generics, permissions
 from rest_framework.exceptions import PermissionDenied
+from core.asyncviews import AsyncReadMixin
+from core.cache import CachedListMixin
+from core.compiled import CompiledListMixin
+from core.conditional import ConditionalGetMixin
+from core.public import PublicReadViewMixin, is_public_read
+from core.sideload import SideloadViewMixin
+from core.sparse import SparseFieldsViewMixin
+from core.views import JSONListFacetView
+from users.authentication import get_user_instance
+from users.models import Domain, Role, User
+from users.serializers import PUBLIC_USER_FIELDS
 from .models import Event
 from .serializers import EventSerializer
 
+PUBLIC_EVENT_FIELDS = [
+    'id', 'name', 'date', 'location', 'description', 'tags', 'created_at', 'updated_at',
+    *(f'created_by_data.{name}' for name in PUBLIC_USER_FIELDS),
+]
+
 class CanManageEventPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
-            return request.user.is_authenticated
+            return request.user.is_authenticated or is_public_read(request, view)
         return request.user.is_authenticated and request.user.can_manage_content()
 
-class EventListCreateView(generics.ListCreateAPIView):
-    queryset = Event.objects.select_related('created_by').all()
+class EventListCreateView(PublicReadViewMixin, SparseFieldsViewMixin, ConditionalGetMixin, CachedListMixin,
+                          SideloadViewMixin, CompiledListMixin, AsyncReadMixin, generics.ListCreateAPIView):
+    queryset = Event.objects.select_related('created_by__role', 'created_by__domain').all()
     serializer_class = EventSerializer
     permission_classes = [CanManageEventPermission]
+    public_fields = PUBLIC_EVENT_FIELDS
+    response_models = [Event, User, Role, Domain]
+    read_from_replica = True
+    json_list_filters = {'tags': 'tags'}
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        serializer.save(created_by=get_user_instance(self.request.user))
+
+class EventFacetView(JSONListFacetView):
+    queryset = Event.objects.all()
+    permission_classes = [CanManageEventPermission]
+    json_list_filters = {'tags': 'tags'}
+    facet_field = 'tags'
 
-class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Event.objects.select_related('created_by').all()
+class EventDetailView(PublicReadViewMixin, SparseFieldsViewMixin, ConditionalGetMixin, AsyncReadMixin,
+                      generics.RetrieveUpdateDestroyAPIView):
+    queryset = Event.objects.select_related('created_by__role', 'created_by__domain').all()
     serializer_class = EventSerializer
     permission_classes = [CanManageEventPermission]
+    public_fields = PUBLIC_EVENT_FIELDS
+    response_models = [Event, User, Role, Domain]
+    read_from_replica = True
 
     def perform_update(self, serializer):
         if not self.request.user.can_manage_content():
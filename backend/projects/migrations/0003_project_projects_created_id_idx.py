@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_initial'),
+        ('users', '0002_alter_user_managers_alter_user_role'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', 'id'], name='projects_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:00
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+from core.operations import PostgresOnly
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_projects_created_id_idx'),
+        ('users', '0003_user_users_name_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status'], name='projects_status_idx'),
+        ),
+        PostgresOnly(migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tech_stack'], name='projects_tech_stack_gin'),
+        )),
+    ]
@@ -1,5 +1,8 @@
 # projects/models.py
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from core.cache import bump_generation
 from users.models import User, Domain
 
 class Project(models.Model):
@@ -16,17 +19,50 @@ class Project(models.Model):
     deployment_link = models.URLField(max_length=500, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_progress')
     image = models.ImageField(upload_to='project_images/', blank=True)
+    # Resized variants of `image`, maintained by core.images.
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='created_projects')
     domains = models.ManyToManyField(Domain, through='ProjectDomain')
     team_members = models.ManyToManyField(User, through='ProjectTeamMember', related_name='projects')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by the search app; only used on PostgreSQL.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.name
 
+    def set_team_members(self, user_ids):
+        """
+        Make the given users the project's team, touching only the rows that
+        change: one delete for removed members and one bulk insert for new
+        ones. Members who stay keep their row, role_in_project and joined_at.
+        """
+        user_ids = set(user_ids)
+        current_ids = set(self.projectteammember_set.values_list('user_id', flat=True))
+
+        removed_ids = current_ids - user_ids
+        if removed_ids:
+            self.projectteammember_set.filter(user_id__in=removed_ids).delete()
+
+        added_ids = user_ids - current_ids
+        if added_ids:
+            ProjectTeamMember.objects.bulk_create(
+                ProjectTeamMember(project=self, user_id=user_id) for user_id in sorted(added_ids)
+            )
+            # bulk_create sends no post_save for the response cache to see.
+            bump_generation(ProjectTeamMember)
+
     class Meta:
         db_table = 'projects'
+        indexes = [
+            # Serves the API ordering and keyset pagination.
+            models.Index(fields=['-created_at', 'id'], name='projects_created_id_idx'),
+            models.Index(fields=['status'], name='projects_status_idx'),
+            # jsonb containment (@>, ?|) for tech stack filters; PostgreSQL only.
+            GinIndex(fields=['tech_stack'], name='projects_tech_stack_gin'),
+            GinIndex(fields=['search_vector'], name='projects_search_gin'),
+        ]
 
 class ProjectDomain(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE)
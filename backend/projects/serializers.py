@@ -1,9 +1,30 @@
 # projects/serializers.py
+from django.db import transaction
 from rest_framework import serializers
+from core.serializers import SrcsetField
+from core.sideload import SideloadMixin
+from core.sparse import SparseFieldsMixin
+from core.timing import TimedListSerializer, TimedSerializerMixin
 from .models import Project, ProjectTeamMember
+from users.models import User, Domain
 from users.serializers import UserSerializer, DomainSerializer
 
-class ProjectTeamMemberSerializer(serializers.ModelSerializer):
+
+def validate_ids_exist(model, ids):
+    """
+    Check every id refers to an existing row with a single IN query, so bad
+    ids are reported up front instead of as an FK error halfway through a save.
+    """
+    ids = list(dict.fromkeys(ids))
+    found = set(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+    missing = [pk for pk in ids if pk not in found]
+    if missing:
+        raise serializers.ValidationError(
+            f"Invalid {model._meta.verbose_name} ids: {', '.join(map(str, missing))}"
+        )
+    return ids
+
+class ProjectTeamMemberSerializer(SideloadMixin, SparseFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.IntegerField(write_only=True)
 
@@ -11,35 +32,43 @@ class ProjectTeamMemberSerializer(serializers.ModelSerializer):
         model = ProjectTeamMember
         fields = ['user', 'user_id', 'role_in_project', 'joined_at']
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TimedSerializerMixin, SideloadMixin, SparseFieldsMixin, serializers.ModelSerializer):
     domains_data = DomainSerializer(source='domains', many=True, read_only=True)
     domain_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True)
     team_members_data = ProjectTeamMemberSerializer(source='projectteammember_set', many=True, read_only=True)
     team_member_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True, required=False)
     created_by_data = UserSerializer(source='created_by', read_only=True)
+    image_srcset = SrcsetField(source='image_variants')
 
     class Meta:
         model = Project
+        list_serializer_class = TimedListSerializer
         fields = [
             'id', 'name', 'description_short', 'description_long', 'tech_stack',
-            'github_link', 'deployment_link', 'status', 'image', 'created_by',
+            'github_link', 'deployment_link', 'status', 'image', 'image_srcset', 'created_by',
             'created_by_data', 'domains_data', 'domain_ids', 'team_members_data',
             'team_member_ids', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_by', 'created_at', 'updated_at']
 
+    def validate_domain_ids(self, value):
+        return validate_ids_exist(Domain, value)
+
+    def validate_team_member_ids(self, value):
+        return validate_ids_exist(User, value)
+
+    @transaction.atomic
     def create(self, validated_data):
         domain_ids = validated_data.pop('domain_ids')
         team_member_ids = validated_data.pop('team_member_ids', [])
         
         project = Project.objects.create(**validated_data)
         project.domains.set(domain_ids)
-        
-        for user_id in team_member_ids:
-            ProjectTeamMember.objects.create(project=project, user_id=user_id)
+        project.set_team_members(team_member_ids)
         
         return project
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         domain_ids = validated_data.pop('domain_ids', None)
         team_member_ids = validated_data.pop('team_member_ids', None)
@@ -52,8 +81,6 @@ class ProjectSerializer(serializers.ModelSerializer):
             instance.domains.set(domain_ids)
         
         if team_member_ids is not None:
-            instance.projectteammember_set.all().delete()
-            for user_id in team_member_ids:
-                ProjectTeamMember.objects.create(project=instance, user_id=user_id)
+            instance.set_team_members(team_member_ids)
         
         return instance
\ No newline at end of file
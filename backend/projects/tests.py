@@ -1,3 +1,140 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from users.models import Domain, Role, User
+from .models import Project, ProjectTeamMember
+
+
+class ProjectQueryCountTests(APITestCase):
+    """
+    The project endpoints must run a fixed number of queries per page, however
+    many projects and team members there are.
+    """
+
+    # The ETag aggregate, COUNT(*) for pagination, the projects themselves
+    # (with created_by, its role and domain joined in), the domains prefetch
+    # and the team member prefetch (with user, role and domain joined in).
+    LIST_QUERIES = 5
+    # The ETag aggregate, the project row and the two prefetches.
+    DETAIL_QUERIES = 4
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Coordinator', can_manage_projects=True)
+        cls.domains = [
+            Domain.objects.create(name='Web Development'),
+            Domain.objects.create(name='AI/ML'),
+        ]
+        cls.members = [
+            User.objects.create_user(
+                username=f'member{i}', email=f'member{i}@example.com', name=f'Member {i}',
+                role=cls.role, domain=cls.domains[i % 2],
+            )
+            for i in range(5)
+        ]
+        cls.owner = cls.members[0]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.owner)
+
+    def create_projects(self, count):
+        projects = []
+        for i in range(count):
+            project = Project.objects.create(
+                name=f'Project {i}', description_short='Short', created_by=self.members[i % 5],
+            )
+            project.domains.set(self.domains)
+            ProjectTeamMember.objects.bulk_create(
+                ProjectTeamMember(project=project, user=user) for user in self.members
+            )
+            projects.append(project)
+        return projects
+
+    def assertListQueries(self, project_count):
+        self.create_projects(project_count)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse('projects:project-list-create'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], project_count)
+        for project in response.data['results']:
+            self.assertEqual(len(project['team_members_data']), 5)
+            self.assertEqual(len(project['domains_data']), 2)
+
+    def test_list_one_project(self):
+        self.assertListQueries(1)
+
+    def test_list_twenty_projects(self):
+        self.assertListQueries(20)
+
+    def test_list_two_hundred_projects(self):
+        self.assertListQueries(200)
+
+    def test_detail(self):
+        project = self.create_projects(1)[0]
+        with self.assertNumQueries(self.DETAIL_QUERIES):
+            response = self.client.get(reverse('projects:project-detail', args=[project.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created_by_data']['role_name'], 'Coordinator')
+        self.assertEqual(len(response.data['team_members_data']), 5)
+
+
+class ProjectWriteTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Coordinator', can_manage_projects=True)
+        cls.domain = Domain.objects.create(name='Web Development')
+        cls.members = [
+            User.objects.create_user(
+                username=f'member{i}', email=f'member{i}@example.com', name=f'Member {i}',
+                role=cls.role, domain=cls.domain,
+            )
+            for i in range(4)
+        ]
+
+    def setUp(self):
+        self.client.force_authenticate(self.members[0])
+
+    def create_project(self, team_member_ids):
+        response = self.client.post(reverse('projects:project-list-create'), {
+            'name': 'Website', 'description_short': 'Short', 'tech_stack': ['django'],
+            'domain_ids': [self.domain.pk], 'team_member_ids': team_member_ids,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return Project.objects.get(pk=response.data['id'])
+
+    def test_create_adds_team_members(self):
+        project = self.create_project([self.members[1].pk, self.members[2].pk])
+        self.assertCountEqual(
+            project.projectteammember_set.values_list('user_id', flat=True),
+            [self.members[1].pk, self.members[2].pk],
+        )
+
+    def test_update_only_touches_changed_members(self):
+        project = self.create_project([self.members[1].pk, self.members[2].pk])
+        kept = project.projectteammember_set.get(user=self.members[2])
+
+        response = self.client.patch(
+            reverse('projects:project-detail', args=[project.pk]),
+            {'team_member_ids': [self.members[2].pk, self.members[3].pk]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertCountEqual(
+            project.projectteammember_set.values_list('user_id', flat=True),
+            [self.members[2].pk, self.members[3].pk],
+        )
+        retained = project.projectteammember_set.get(user=self.members[2])
+        self.assertEqual(retained.pk, kept.pk)
+        self.assertEqual(retained.joined_at, kept.joined_at)
+
+    def test_unknown_ids_are_rejected_before_saving(self):
+        response = self.client.post(reverse('projects:project-list-create'), {
+            'name': 'Website', 'description_short': 'Short', 'tech_stack': [],
+            'domain_ids': [self.domain.pk, 999], 'team_member_ids': [self.members[1].pk, 998],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('domain_ids', response.data)
+        self.assertIn('team_member_ids', response.data)
+        self.assertFalse(Project.objects.exists())
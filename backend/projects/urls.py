@@ -1,10 +1,12 @@
 # projects/urls.py
 from django.urls import path
+from core.asyncviews import read_view
 from . import views
 
 app_name = 'projects'
 
 urlpatterns = [
-    path('', views.ProjectListCreateView.as_view(), name='project-list-create'),
-    path('<int:pk>/', views.ProjectDetailView.as_view(), name='project-detail'),
+    path('', read_view(views.ProjectListCreateView), name='project-list-create'),
+    path('<int:pk>/', read_view(views.ProjectDetailView), name='project-detail'),
+    path('facets/', views.ProjectFacetView.as_view(), name='project-facets'),
 ]
@@ -1,27 +1,79 @@
 # projects/views.py
+from django.db.models import Prefetch
 from rest_framework import generics, permissions
 from rest_framework.exceptions import PermissionDenied
-from .models import Project
+from core.asyncviews import AsyncReadMixin
+from core.cache import CachedListMixin
+from core.compiled import CompiledListMixin
+from core.conditional import ConditionalGetMixin
+from core.public import PublicReadViewMixin, is_public_read
+from core.sideload import SideloadViewMixin
+from core.sparse import SparseFieldsViewMixin
+from core.views import JSONListFacetView
+from users.authentication import get_user_instance
+from users.models import Domain, Role, User
+from users.serializers import PUBLIC_USER_FIELDS
+from .models import Project, ProjectDomain, ProjectTeamMember
 from .serializers import ProjectSerializer
 
+
+def get_project_queryset():
+    """
+    Queryset for the project endpoints with every relation the serializer
+    touches loaded up front, so the number of queries per page stays fixed
+    no matter how many projects or team members it holds.
+    """
+    team_members = ProjectTeamMember.objects.select_related('user__role', 'user__domain')
+    return Project.objects.select_related(
+        'created_by__role', 'created_by__domain'
+    ).prefetch_related(
+        'domains',
+        Prefetch('projectteammember_set', queryset=team_members),
+    ).order_by('-created_at', 'id')
+
+
+PUBLIC_PROJECT_FIELDS = [
+    'id', 'name', 'description_short', 'description_long', 'tech_stack', 'github_link',
+    'deployment_link', 'status', 'image', 'image_srcset', 'domains_data', 'team_members_data.role_in_project',
+    'created_at', 'updated_at',
+    *(f'created_by_data.{name}' for name in PUBLIC_USER_FIELDS),
+    *(f'team_members_data.user.{name}' for name in PUBLIC_USER_FIELDS),
+]
+
+
 class CanManageProjectPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
-            return request.user.is_authenticated
+            return request.user.is_authenticated or is_public_read(request, view)
         return request.user.is_authenticated and request.user.can_manage_content()
 
-class ProjectListCreateView(generics.ListCreateAPIView):
-    queryset = Project.objects.select_related('created_by').prefetch_related('domains', 'team_members').all()
+class ProjectListCreateView(PublicReadViewMixin, SparseFieldsViewMixin, ConditionalGetMixin, CachedListMixin,
+                            SideloadViewMixin, CompiledListMixin, AsyncReadMixin, generics.ListCreateAPIView):
+    queryset = get_project_queryset()
     serializer_class = ProjectSerializer
     permission_classes = [CanManageProjectPermission]
+    public_fields = PUBLIC_PROJECT_FIELDS
+    response_models = [Project, ProjectTeamMember, ProjectDomain, Domain, Role, User]
+    read_from_replica = True
+    json_list_filters = {'tech': 'tech_stack'}
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        serializer.save(created_by=get_user_instance(self.request.user))
+
+class ProjectFacetView(JSONListFacetView):
+    queryset = Project.objects.all()
+    permission_classes = [CanManageProjectPermission]
+    json_list_filters = {'tech': 'tech_stack'}
+    facet_field = 'tech_stack'
 
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Project.objects.select_related('created_by').prefetch_related('domains', 'team_members').all()
+class ProjectDetailView(PublicReadViewMixin, SparseFieldsViewMixin, ConditionalGetMixin, AsyncReadMixin,
+                        generics.RetrieveUpdateDestroyAPIView):
+    queryset = get_project_queryset()
     serializer_class = ProjectSerializer
     permission_classes = [CanManageProjectPermission]
+    public_fields = PUBLIC_PROJECT_FIELDS
+    response_models = [Project, ProjectTeamMember, ProjectDomain, Domain, Role, User]
+    read_from_replica = True
 
     def perform_update(self, serializer):
         if not self.request.user.can_manage_content():
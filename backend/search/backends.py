@@ -0,0 +1,157 @@
+# search/backends.py
+"""
+Full-text search over events, projects and members.
+
+On PostgreSQL every searchable model carries a weighted `search_vector`
+tsvector column with a GIN index, and results are ranked with ts_rank. Other
+databases (SQLite in development and tests) use an FTS5 table,
+`search_index`, ranked with bm25. Either way the index is updated one row at a
+time from the signal handlers in search/signals.py, and `rebuild` refreshes a
+whole table in a single statement.
+"""
+from django.apps import apps
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, connections
+from django.db.models import F
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'search_index'
+
+# kind -> (model, {field: weight}, fields returned in results)
+DOCUMENTS = {
+    'event': ('events.Event', {'name': 'A', 'description': 'B', 'location': 'C'},
+              ['id', 'name', 'date', 'location']),
+    'project': ('projects.Project', {'name': 'A', 'description_short': 'B', 'description_long': 'C'},
+                ['id', 'name', 'description_short', 'status']),
+    'member': ('users.User', {'name': 'A', 'skills': 'B'},
+               ['id', 'name', 'batch', 'role__name']),
+}
+
+
+def get_model(kind, app_registry=apps):
+    return app_registry.get_model(DOCUMENTS[kind][0])
+
+
+def get_kind(model):
+    for kind, (label, _, _) in DOCUMENTS.items():
+        if model._meta.label == label:
+            return kind
+    return None
+
+
+def indexed_fields(kind):
+    return DOCUMENTS[kind][1]
+
+
+def search_vector(kind):
+    vectors = [
+        SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        for field, weight in indexed_fields(kind).items()
+    ]
+    vector = vectors[0]
+    for other in vectors[1:]:
+        vector = vector + other
+    return vector
+
+
+def use_postgres(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+def rebuild(kind, queryset):
+    """(Re)index every row of `queryset`, a queryset of the kind's model."""
+    if use_postgres(queryset.db):
+        queryset.update(search_vector=search_vector(kind))
+        return
+
+    model = queryset.model
+    connection = connections[queryset.db]
+    quote = connection.ops.quote_name
+    fields = indexed_fields(kind)
+    name_field = next(field for field, weight in fields.items() if weight == 'A')
+    body = " || ' ' || ".join(
+        f"COALESCE({quote(model._meta.get_field(field).column)}, '')"
+        for field in fields if field != name_field
+    )
+    pk_sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE kind = %s AND object_id IN ({pk_sql})',
+            [kind, *params],
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (kind, object_id, name, body) '
+            f'SELECT %s, {quote(model._meta.pk.column)}, '
+            f'COALESCE({quote(model._meta.get_field(name_field).column)}, \'\'), {body} '
+            f'FROM {quote(model._meta.db_table)} WHERE {quote(model._meta.pk.column)} IN ({pk_sql})',
+            [kind, *params],
+        )
+
+
+def index(instance):
+    kind = get_kind(type(instance))
+    rebuild(kind, type(instance)._default_manager.filter(pk=instance.pk))
+
+
+def remove(instance):
+    if use_postgres():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE kind = %s AND object_id = %s',
+            [get_kind(type(instance)), instance.pk],
+        )
+
+
+def search(query, kinds, limit):
+    """Return up to `limit` (kind, pk, rank) matches per kind, best first."""
+    if use_postgres():
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        matches = []
+        for kind in kinds:
+            queryset = get_model(kind)._default_manager.filter(search_vector=search_query)
+            if kind == 'member':
+                queryset = queryset.filter(is_active=True)
+            matches += [
+                (kind, pk, rank) for pk, rank in queryset.annotate(
+                    rank=SearchRank(F('search_vector'), search_query)
+                ).order_by('-rank').values_list('pk', 'rank')[:limit]
+            ]
+        return matches
+
+    # Quote every term so FTS5 treats user input as plain words.
+    terms = ' '.join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+    if not terms:
+        return []
+    placeholders = ', '.join(['%s'] * len(kinds))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT kind, object_id, -bm25({FTS_TABLE}, 0, 0, 10.0, 1.0) AS rank FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND kind IN ({placeholders}) ORDER BY rank DESC',
+            [terms, *kinds],
+        )
+        rows = cursor.fetchall()
+    if 'member' in kinds:
+        # Inactive members stay indexed; drop them before applying the limit,
+        # as the PostgreSQL query does.
+        active = set(get_model('member')._default_manager.filter(
+            pk__in=[pk for kind, pk, _ in rows if kind == 'member'], is_active=True,
+        ).values_list('pk', flat=True))
+        rows = [row for row in rows if row[0] != 'member' or row[1] in active]
+    matches = []
+    for kind in kinds:
+        matches += [row for row in rows if row[0] == kind][:limit]
+    return matches
+
+
+def create_fts_table(schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+            f'kind UNINDEXED, object_id UNINDEXED, name, body, tokenize="porter unicode61")'
+        )
+
+
+def drop_fts_table(schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from search import backends
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for events, projects and members'
+
+    def handle(self, *args, **options):
+        for kind in backends.DOCUMENTS:
+            queryset = backends.get_model(kind)._default_manager.all()
+            backends.rebuild(kind, queryset)
+            self.stdout.write(f'Indexed {queryset.count()} {kind}(s)')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from search.backends import DOCUMENTS, create_fts_table, drop_fts_table, get_model, rebuild
+
+
+def build_index(apps, schema_editor):
+    create_fts_table(schema_editor)
+    for kind in DOCUMENTS:
+        model = get_model(kind, apps)
+        rebuild(kind, model._default_manager.using(schema_editor.connection.alias).all())
+
+
+def remove_index(apps, schema_editor):
+    drop_fts_table(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_search_vector'),
+        ('projects', '0005_project_search_vector'),
+        ('users', '0005_user_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_index, remove_index),
+    ]
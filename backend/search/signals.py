@@ -0,0 +1,22 @@
+# search/signals.py
+from django.db.models.signals import post_delete, post_save
+
+from . import backends
+
+
+def update_document(sender, instance, update_fields=None, **kwargs):
+    kind = backends.get_kind(sender)
+    # Saves that only touch unindexed columns (e.g. last_login) don't need it.
+    if update_fields is not None and not set(update_fields) & set(backends.indexed_fields(kind)):
+        return
+    backends.index(instance)
+
+
+def remove_document(sender, instance, **kwargs):
+    backends.remove(instance)
+
+
+for kind in backends.DOCUMENTS:
+    model = backends.get_model(kind)
+    post_save.connect(update_document, sender=model, dispatch_uid=f'search-{kind}-save')
+    post_delete.connect(remove_document, sender=model, dispatch_uid=f'search-{kind}-delete')
@@ -0,0 +1,71 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from events.models import Event
+from projects.models import Project
+from users.models import User
+
+
+class SearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='asha', email='asha@example.com', name='Asha Verma', skills=['rust', 'compilers'],
+        )
+        cls.event = Event.objects.create(
+            name='Rust Workshop', date='2025-09-01', location='LHC 101',
+            description='An introduction to systems programming', created_by=cls.user,
+        )
+        cls.project = Project.objects.create(
+            name='Compiler Playground', description_short='Browser playground for a toy compiler',
+            description_long='Written in Rust and compiled to WebAssembly.', created_by=cls.user,
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def search(self, **params):
+        response = self.client.get(reverse('search:search'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(result['type'], result['id']) for result in response.data['results']]
+
+    def test_finds_every_type(self):
+        self.assertCountEqual(self.search(q='rust'), [
+            ('event', self.event.pk), ('project', self.project.pk), ('member', self.user.pk),
+        ])
+
+    def test_name_matches_rank_first(self):
+        self.assertEqual(self.search(q='rust')[0], ('event', self.event.pk))
+
+    def test_type_filter(self):
+        self.assertEqual(self.search(q='compiler', type='project'), [('project', self.project.pk)])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.event.name = 'Go Workshop'
+        self.event.description = ''
+        self.event.save()
+        self.assertNotIn(('event', self.event.pk), self.search(q='rust'))
+        self.assertEqual(self.search(q='go', type='event'), [('event', self.event.pk)])
+
+        self.event.delete()
+        self.assertEqual(self.search(q='go', type='event'), [])
+
+    def test_inactive_members_are_hidden(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertNotIn(('member', self.user.pk), self.search(q='asha'))
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get(reverse('search:search')).status_code, 400)
+        self.assertEqual(self.client.get(reverse('search:search'), {'q': 'x', 'type': 'nope'}).status_code, 400)
+
+    def test_limit_must_be_positive(self):
+        for limit in ['0', '-1', 'x']:
+            response = self.client.get(reverse('search:search'), {'q': 'rust', 'limit': limit})
+            self.assertEqual(response.status_code, 400, limit)
+
+    def test_limit_counts_active_members_only(self):
+        User.objects.create_user(
+            username='ravi', email='ravi@example.com', name='Ravi Rust', skills=['rust'], is_active=False,
+        )
+        self.assertEqual(self.search(q='rust', type='member', limit=1), [('member', self.user.pk)])
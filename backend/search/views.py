@@ -0,0 +1,60 @@
+# search/views.py
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import backends
+
+MAX_LIMIT = 50
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search across events, projects and members:
+    `?q=<words>`, optionally `?type=event,project,member` and `?limit=`
+    (per type, default 10).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'This query parameter is required.'})
+
+        kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+        unknown = set(kinds) - set(backends.DOCUMENTS)
+        if unknown:
+            raise ValidationError({'type': f"Unknown types: {', '.join(sorted(unknown))}"})
+        kinds = kinds or list(backends.DOCUMENTS)
+
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        if limit < 1:
+            raise ValidationError({'limit': 'Ensure this value is greater than or equal to 1.'})
+
+        matches = backends.search(query, kinds, limit)
+        return Response({'results': self.hydrate(matches)})
+
+    def hydrate(self, matches):
+        """Load the fields returned for each match, one query per type."""
+        rows = {}
+        for kind in {kind for kind, _, _ in matches}:
+            fields = backends.DOCUMENTS[kind][2]
+            queryset = backends.get_model(kind)._default_manager.filter(
+                pk__in=[pk for match_kind, pk, _ in matches if match_kind == kind]
+            )
+            if kind == 'member':
+                queryset = queryset.filter(is_active=True)
+            for row in queryset.values(*fields):
+                if 'role__name' in row:
+                    row['role_name'] = row.pop('role__name')
+                rows[kind, row['id']] = row
+
+        return [
+            {'type': kind, 'rank': rank, **rows[kind, pk]}
+            for kind, pk, rank in sorted(matches, key=lambda match: -match[2])
+            if (kind, pk) in rows
+        ]
@@ -11,7 +11,9 @@ class DomainAdmin(admin.ModelAdmin):
 
 @admin.register(Role)
 class RoleAdmin(admin.ModelAdmin):
-    list_display = ['name', 'can_manage_events', 'can_manage_projects']
+    list_display = ['name', 'rank', 'can_manage_events', 'can_manage_projects']
+    list_editable = ['rank']
+    ordering = ['rank', 'name']
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -0,0 +1,98 @@
+# users/authentication.py
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication, models
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    Simple JWT authentication that loads the user together with their role
+    and domain in one query, so permission checks and serializers that read
+    `request.user.role` don't need a second round trip.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            user = self.user_model.objects.select_related('role', 'domain').get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+class TokenUser(models.TokenUser):
+    """
+    Stateless user built from the claims MyTokenObtainPairSerializer puts in
+    the token. It answers the questions permissions ask (is_active, role,
+    can_manage_content) without touching the database; `instance` loads the
+    real User for the few places that need one.
+
+    The claims are fixed when the refresh token is issued, so role or
+    activation changes reach a stateless user on their next login.
+    """
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', True)
+
+    @cached_property
+    def role_id(self):
+        return self.token.get('role_id')
+
+    @cached_property
+    def domain_id(self):
+        return self.token.get('domain_id')
+
+    def can_manage_content(self):
+        if 'role_id' not in self.token:
+            # Issued before the permission claims existed.
+            return self.instance.can_manage_content()
+        if self.role_id is None:
+            return self.is_superuser
+        return self.token.get('can_manage_events', False) or self.token.get('can_manage_projects', False)
+
+    @cached_property
+    def instance(self):
+        return get_user_model().objects.select_related('role', 'domain').get(pk=self.id)
+
+
+class StatelessJWTAuthentication(authentication.JWTStatelessUserAuthentication):
+    """
+    Opt-in alternative to JWTAuthentication (see JWT_STATELESS_AUTH in
+    settings) that trusts the token's claims instead of looking the user up
+    on every request.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = TokenUser(validated_token)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+def get_user_instance(user):
+    """Return the User model instance behind request.user, loading it for token users."""
+    if isinstance(user, TokenUser):
+        return user.instance
+    return user
@@ -0,0 +1,72 @@
+# users/avatars.py
+"""
+Initials avatars for members without a profile picture.
+
+An avatar depends only on the name, size and format, so it is served as
+immutable and kept in a bounded, process-local LRU cache. Nothing is written
+to storage: the URL takes any name, and anyone could otherwise fill the disk.
+Colours are picked from a hash of the name, not Python's randomised hash(),
+so every worker and every restart draws the same avatar.
+"""
+import hashlib
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from PIL import Image, ImageDraw, ImageFont
+
+CONTENT_TYPES = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+}
+MIN_SIZE = 16
+MAX_SIZE = 512
+BACKGROUNDS = [
+    '#1abc9c', '#2ecc71', '#3498db', '#9b59b6', '#34495e', '#16a085', '#27ae60', '#2980b9',
+    '#8e44ad', '#2c3e50', '#e67e22', '#e74c3c', '#d35400', '#c0392b', '#7f8c8d', '#f39c12',
+]
+
+
+def initials(name):
+    words = name.split()
+    if not words:
+        return '?'
+    if len(words) == 1:
+        return words[0][:2].upper()
+    return (words[0][0] + words[-1][0]).upper()
+
+
+def background(name):
+    digest = hashlib.md5(name.encode()).digest()
+    return BACKGROUNDS[digest[0] % len(BACKGROUNDS)]
+
+
+def render_svg(name, size):
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">'
+        f'<rect width="100%" height="100%" fill="{background(name)}"/>'
+        f'<text x="50%" y="50%" dy=".35em" fill="#fff" text-anchor="middle" '
+        f'font-family="Helvetica, Arial, sans-serif" font-size="{round(size * 0.4)}">{escape(initials(name))}</text>'
+        f'</svg>'
+    ).encode()
+
+
+def render_png(name, size):
+    image = Image.new('RGB', (size, size), background(name))
+    font = ImageFont.load_default(size=round(size * 0.4))
+    ImageDraw.Draw(image).text((size / 2, size / 2), initials(name), fill='white', font=font, anchor='mm')
+    buffer = BytesIO()
+    image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+RENDERERS = {
+    'svg': render_svg,
+    'png': render_png,
+}
+
+
+@lru_cache(maxsize=1024)
+def get_avatar(name, size, fmt):
+    """Return the avatar bytes, rendering them on a miss."""
+    return RENDERERS[fmt](name, size)
@@ -0,0 +1,73 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from events.views import EventListCreateView
+from users.authentication import JWTAuthentication, StatelessJWTAuthentication
+from users.serializers import MyTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Compare requests/sec on /api/events/ with database-backed and stateless JWT authentication'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', type=str, help='Authenticate as this existing user')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per mode')
+        parser.add_argument('--warmup', type=int, default=20, help='Untimed requests per mode')
+
+    def handle(self, *args, **options):
+        # Anything created for the benchmark is rolled back at the end.
+        with transaction.atomic():
+            user = self.get_user(options['email'])
+            token = MyTokenObtainPairSerializer.get_token(user).access_token
+            client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'{jwt_settings.AUTH_HEADER_TYPES[0]} {token}')
+
+            results = {}
+            for label, authentication_class in [
+                ('database', JWTAuthentication),
+                ('stateless', StatelessJWTAuthentication),
+            ]:
+                results[label] = self.run_mode(client, authentication_class, options['requests'], options['warmup'])
+                self.stdout.write(f'{label:>10}: {results[label]:8.1f} req/s')
+
+            transaction.set_rollback(True)
+
+        speedup = results['stateless'] / results['database']
+        self.stdout.write(self.style.SUCCESS(f'Stateless authentication is {speedup:.2f}x the database-backed throughput'))
+
+    def get_user(self, email):
+        if email:
+            try:
+                return User.objects.get(email=email)
+            except User.DoesNotExist:
+                raise CommandError(f'User with email {email} does not exist')
+        return User.objects.create_user(
+            username='benchmark-auth', email='benchmark-auth@example.com', name='Benchmark',
+        )
+
+    def run_mode(self, client, authentication_class, requests, warmup):
+        url = reverse('events:event-list-create')
+        original = EventListCreateView.authentication_classes
+        EventListCreateView.authentication_classes = [authentication_class]
+        try:
+            for _ in range(warmup):
+                self.get(client, url)
+            start = time.perf_counter()
+            for _ in range(requests):
+                self.get(client, url)
+            elapsed = time.perf_counter() - start
+        finally:
+            EventListCreateView.authentication_classes = original
+        return requests / elapsed
+
+    def get(self, client, url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f'GET {url} returned {response.status_code}')
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+from core.operations import PostgresOnly
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0003_user_users_name_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_active'], name='users_is_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['batch'], name='users_batch_idx'),
+        ),
+        PostgresOnly(migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['skills'], name='users_skills_gin'),
+        )),
+    ]
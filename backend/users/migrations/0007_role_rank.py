@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+def rank_president_first(apps, schema_editor):
+    apps.get_model('users', 'Role').objects.filter(name='President').update(rank=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_profile_pic_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='role',
+            name='rank',
+            field=models.PositiveSmallIntegerField(default=100),
+        ),
+        migrations.RunPython(rank_president_first, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,10 @@
 # users/models.py
 from django.contrib.auth.models import AbstractUser, UserManager
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.exceptions import ValidationError
+from .role_cache import get_role_permissions
 
 
 class Domain(models.Model):
@@ -18,6 +21,8 @@ class Domain(models.Model):
 
 class Role(models.Model):
     name = models.CharField(max_length=50, unique=True)
+    # Seniority on the team roster; lower ranks are listed first.
+    rank = models.PositiveSmallIntegerField(default=100)
     can_manage_events = models.BooleanField(default=False)
     can_manage_projects = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -43,7 +48,8 @@ class CustomUserManager(UserManager):
             name='President',
             defaults={
                 'can_manage_events': True,
-                'can_manage_projects': True
+                'can_manage_projects': True,
+                'rank': 0,
             }
         )
         extra_fields['role'] = president_role
@@ -76,10 +82,14 @@ class User(AbstractUser):
     instagram_link = models.URLField(max_length=500, blank=True)
     linkedin_link = models.URLField(max_length=500, blank=True)
     profile_pic = models.ImageField(upload_to='profile_pics/', blank=True)
+    # Resized variants of `profile_pic`, maintained by core.images.
+    profile_pic_variants = models.JSONField(default=dict, blank=True, editable=False)
     skills = models.JSONField(default=list, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by the search app; only used on PostgreSQL.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     objects = CustomUserManager()
 
@@ -101,13 +111,31 @@ class User(AbstractUser):
         super().save(*args, **kwargs)
 
     def can_manage_content(self):
-        if not self.role:
+        if self.role_id is None:
             return self.is_superuser
-        return self.role.can_manage_events or self.role.can_manage_projects
+        if User.role.is_cached(self):
+            permissions = self.role
+        else:
+            # Fall back to the role cache rather than self.role, so the check
+            # costs no query even when the role wasn't loaded with the user.
+            permissions = get_role_permissions(self.role_id)
+            if permissions is None:
+                return self.is_superuser
+        return permissions.can_manage_events or permissions.can_manage_projects
 
     def __str__(self):
         role_name = self.role.name if self.role else 'No Role'
         return f"{self.name} ({role_name})"
 
     class Meta:
-        db_table = 'users'
\ No newline at end of file
+        db_table = 'users'
+        indexes = [
+            # Serves the API ordering and keyset pagination.
+            models.Index(fields=['name', 'id'], name='users_name_id_idx'),
+            # UserAdmin.list_filter
+            models.Index(fields=['is_active'], name='users_is_active_idx'),
+            models.Index(fields=['batch'], name='users_batch_idx'),
+            # jsonb containment (@>, ?|) for skill filters; PostgreSQL only.
+            GinIndex(fields=['skills'], name='users_skills_gin'),
+            GinIndex(fields=['search_vector'], name='users_search_gin'),
+        ]
\ No newline at end of file
@@ -0,0 +1,50 @@
+# users/role_cache.py
+"""
+Process-local cache of the permission flags attached to each Role.
+
+Roles are few and almost never change, while their flags are checked on every
+write request. Entries are dropped by the Role post_save/post_delete signal
+handlers in users/signals.py, so a role edit takes effect immediately in the
+process that made it. Other worker processes don't see the signal; their
+entries expire after settings.ROLE_PERMISSIONS_CACHE_TTL seconds, which
+bounds how long they keep granting a revoked permission.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+RolePermissions = namedtuple('RolePermissions', ['can_manage_events', 'can_manage_projects'])
+
+_permissions = {}
+_lock = threading.Lock()
+
+
+def get_role_permissions(role_id):
+    """Return the RolePermissions for `role_id`, or None if the role doesn't exist."""
+    entry = _permissions.get(role_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    from .models import Role
+
+    flags = Role.objects.filter(pk=role_id).values_list(
+        'can_manage_events', 'can_manage_projects'
+    ).first()
+    if flags is None:
+        return None
+
+    permissions = RolePermissions(*flags)
+    with _lock:
+        _permissions[role_id] = (time.monotonic() + settings.ROLE_PERMISSIONS_CACHE_TTL, permissions)
+    return permissions
+
+
+def invalidate_role(role_id=None):
+    """Forget the cached flags for one role, or for every role when no id is given."""
+    with _lock:
+        if role_id is None:
+            _permissions.clear()
+        else:
+            _permissions.pop(role_id, None)
@@ -0,0 +1,74 @@
+# users/roster.py
+"""
+The team roster: active members grouped by role, most senior first, then by
+domain, in one ordered query over users joined to their role and domain.
+Members carry only their public fields. The result is cached under the
+core.cache generations of User, Role and Domain, so any edit to them
+rebuilds it, and under the request's origin, which its picture URLs use.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import F
+
+from core.cache import get_generations
+from core.images import variant_for_width
+from .models import Domain, Role, User
+from .serializers import PUBLIC_MEMBER_FIELDS, avatar_url
+
+ROSTER_MODELS = [User, Role, Domain]
+
+# The public member fields the roster doesn't show its own way: role and
+# domain are the groups, and the profile picture is `picture`.
+MEMBER_FIELDS = [
+    field for field in PUBLIC_MEMBER_FIELDS
+    if field not in ('role_name', 'domain_name', 'profile_pic', 'profile_pic_srcset')
+]
+
+
+def picture_url(row, request=None):
+    """A profile picture about AVATAR_SIZE wide: a variant, the original or the initials avatar."""
+    name = variant_for_width(row['profile_pic_variants'], settings.AVATAR_SIZE) or row['profile_pic']
+    if not name:
+        return avatar_url(row['name'], request)
+    url = default_storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def build_roster(request=None):
+    rows = (
+        User.objects.filter(is_active=True)
+        .order_by(
+            F('role__rank').asc(nulls_last=True), F('role__name').asc(nulls_last=True),
+            F('domain__name').asc(nulls_last=True), 'name', 'id',
+        )
+        .values(*MEMBER_FIELDS, 'profile_pic', 'profile_pic_variants',
+                'role_id', 'role__name', 'domain_id', 'domain__name')
+    )
+
+    roles = []
+    for row in rows:
+        if not roles or roles[-1]['id'] != row['role_id']:
+            roles.append({'id': row['role_id'], 'name': row['role__name'], 'domains': []})
+        domains = roles[-1]['domains']
+        if not domains or domains[-1]['id'] != row['domain_id']:
+            domains.append({'id': row['domain_id'], 'name': row['domain__name'], 'members': []})
+        member = {field: row[field] for field in MEMBER_FIELDS}
+        member['picture'] = picture_url(row, request)
+        domains[-1]['members'].append(member)
+    return {'roles': roles}
+
+
+def get_roster(request=None):
+    origin = request.build_absolute_uri('/') if request is not None else ''
+    key = 'roster:{}:{}'.format(
+        hashlib.md5(origin.encode()).hexdigest(),
+        '.'.join(str(generation) for generation in get_generations(ROSTER_MODELS)),
+    )
+    roster = cache.get(key)
+    if roster is None:
+        roster = build_roster(request)
+        cache.set(key, roster, settings.RESPONSE_CACHE_TIMEOUT)
+    return roster
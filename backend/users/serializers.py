@@ -1,37 +1,79 @@
 # users/serializers.py
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import authenticate
+from django.urls import reverse
 from .models import User, Domain, Role
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from core.serializers import SrcsetField
+from core.sideload import SideloadMixin
+from core.sparse import SparseFieldsMixin
+from core.timing import TimedListSerializer, TimedSerializerMixin
 
 
-class DomainSerializer(serializers.ModelSerializer):
+class DomainSerializer(TimedSerializerMixin, SideloadMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    included_key = 'domains'
+
     class Meta:
         model = Domain
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'description']
 
-class RoleSerializer(serializers.ModelSerializer):
+class RoleSerializer(TimedSerializerMixin, SideloadMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    included_key = 'roles'
+
     class Meta:
         model = Role
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'can_manage_events', 'can_manage_projects']
 
-class UserSerializer(serializers.ModelSerializer):
+# What anonymous readers see of a user nested in public content (core.public).
+PUBLIC_USER_FIELDS = ['id', 'name', 'role_name', 'domain_name', 'profile_pic', 'profile_pic_srcset']
+# ...and of a member on the public team page (users.roster, the `team`
+# snapshot in core.snapshots). No contact links either.
+PUBLIC_MEMBER_FIELDS = PUBLIC_USER_FIELDS + ['batch', 'skills']
+
+class UserSerializer(TimedSerializerMixin, SideloadMixin, SparseFieldsMixin, serializers.ModelSerializer):
     domain_name = serializers.CharField(source='domain.name', read_only=True)
     role_name = serializers.CharField(source='role.name', read_only=True)
     password = serializers.CharField(write_only=True)
+    profile_pic_srcset = SrcsetField(source='profile_pic_variants')
+    # The avatar that stands in for a missing profile_pic is drawn from the name.
+    sparse_requires = {'profile_pic': ['name']}
+    included_key = 'users'
+    # Normalized responses side-load the role and domain instead of naming them.
+    sideload_related = {
+        'role': (RoleSerializer, ['role_name']),
+        'domain': (DomainSerializer, ['domain_name']),
+    }
 
     class Meta:
         model = User
+        list_serializer_class = TimedListSerializer
         fields = [
             'id', 'username', 'name', 'email', 'password', 'role', 'role_name',
             'domain', 'domain_name', 'batch', 'github_link', 'instagram_link',
-            'linkedin_link', 'profile_pic', 'skills', 'is_active', 'created_at'
+            'linkedin_link', 'profile_pic', 'profile_pic_srcset', 'skills', 'is_active', 'created_at'
         ]
         extra_kwargs = {
             'password': {'write_only': True},
             'created_at': {'read_only': True}
         }
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        return self.finalize_representation(data, {'name': instance.name}, self.context)
+
+    @staticmethod
+    def finalize_representation(data, values, context):
+        """
+        Fill in the avatar for a missing profile_pic. `values` holds the
+        sparse_requires fields; core.compiled calls this with them too.
+        """
+        if 'profile_pic' in data and not data['profile_pic']:
+            data['profile_pic'] = avatar_url(values['name'], context.get('request'))
+        return data
+
     def create(self, validated_data):
         password = validated_data.pop('password')
         user = User.objects.create_user(**validated_data)
@@ -39,6 +81,16 @@ class UserSerializer(serializers.ModelSerializer):
         user.save()
         return user
 
+def avatar_url(name, request=None, size=None, fmt='svg'):
+    """URL of the generated initials avatar for `name` (see users.avatars)."""
+    url = reverse('users:avatar', kwargs={
+        'size': size or settings.AVATAR_SIZE,
+        # Path segments can't carry a slash, even encoded.
+        'name': name.replace('/', ' ') or '?',
+        'fmt': fmt,
+    })
+    return request.build_absolute_uri(url) if request is not None else url
+
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField()
@@ -63,8 +115,15 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     def get_token(cls, user):
         token = super().get_token(user)
 
-        # You can add custom claims to the token itself if needed
-        # token['first_name'] = user.first_name
+        # Claims read by users.authentication.TokenUser, so stateless
+        # authentication can authorize requests without loading the user.
+        token['role_id'] = user.role_id
+        token['domain_id'] = user.domain_id
+        token['is_active'] = user.is_active
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        token['can_manage_events'] = bool(user.role and user.role.can_manage_events)
+        token['can_manage_projects'] = bool(user.role and user.role.can_manage_projects)
         
         return token
 
@@ -0,0 +1,12 @@
+# users/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Role
+from .role_cache import invalidate_role
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_role_permissions(sender, instance, **kwargs):
+    invalidate_role(instance.pk)
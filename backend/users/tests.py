@@ -1,3 +1,239 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from events.views import EventListCreateView
+from . import avatars
+from .authentication import StatelessJWTAuthentication
+from .models import Domain, Role, User
+from .role_cache import invalidate_role
+from .serializers import MyTokenObtainPairSerializer
+
+
+class RolePermissionCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        cls.domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='coordinator', email='coordinator@example.com', name='Coordinator',
+            password='secret-pass-123', role=cls.role, domain=cls.domain,
+        )
+
+    def setUp(self):
+        cache.clear()
+        invalidate_role()
+
+    def test_permissions_are_cached_per_role(self):
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.can_manage_content())
+        with self.assertNumQueries(0):
+            self.assertTrue(User(pk=user.pk, role_id=self.role.pk).can_manage_content())
+
+    def test_role_changes_invalidate_the_cache(self):
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.can_manage_content())
+
+        self.role.can_manage_events = False
+        self.role.save()
+        self.assertFalse(User.objects.get(pk=self.user.pk).can_manage_content())
+
+    def test_entries_expire(self):
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.can_manage_content())
+
+        # A change made by another worker process: no signal reaches this one.
+        Role.objects.filter(pk=self.role.pk).update(can_manage_events=False)
+        self.assertTrue(user.can_manage_content())
+        later = time.monotonic() + settings.ROLE_PERMISSIONS_CACHE_TTL + 1
+        with mock.patch('users.role_cache.time.monotonic', return_value=later):
+            self.assertFalse(user.can_manage_content())
+
+    def test_authentication_loads_role_and_domain(self):
+        token = self.client.post(reverse('users:token_obtain_pair'), {
+            'email': 'coordinator@example.com', 'password': 'secret-pass-123',
+        }).data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        # The user (joined with role and domain), the ETag aggregate, then the
+        # paginated domain list.
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('users:domain-list'))
+        self.assertEqual(response.status_code, 200)
+
+        # Authorizing the write costs nothing beyond loading the user.
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('events:event-list-create'), {})
+        self.assertEqual(response.status_code, 400)
+
+
+class StatelessAuthenticationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Coordinator', can_manage_events=True)
+        cls.domain = Domain.objects.create(name='Web Development')
+        cls.user = User.objects.create_user(
+            username='coordinator', email='coordinator@example.com', name='Coordinator',
+            password='secret-pass-123', role=cls.role, domain=cls.domain,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.original = EventListCreateView.authentication_classes
+        EventListCreateView.authentication_classes = [StatelessJWTAuthentication]
+        token = MyTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def tearDown(self):
+        EventListCreateView.authentication_classes = self.original
+
+    def test_token_carries_permission_claims(self):
+        token = MyTokenObtainPairSerializer.get_token(self.user)
+        self.assertEqual(token['role_id'], self.role.pk)
+        self.assertEqual(token['domain_id'], self.domain.pk)
+        self.assertTrue(token['can_manage_events'])
+        self.assertFalse(token['can_manage_projects'])
+
+    def test_reads_skip_the_user_lookup(self):
+        # Only the ETag aggregate and the pagination COUNT; there are no
+        # events to select.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('events:event-list-create'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_writes_use_the_full_user(self):
+        response = self.client.post(reverse('events:event-list-create'), {
+            'name': 'Hackathon', 'date': '2025-09-01', 'location': 'LHC',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created_by'], self.user.pk)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AvatarTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='ada', email='ada@example.com', name='Ada Lovelace')
+
+    def setUp(self):
+        cache.clear()
+        avatars.get_avatar.cache_clear()
+        self.client.force_authenticate(self.user)
+
+    def test_serializer_falls_back_to_the_avatar(self):
+        response = self.client.get(reverse('users:user-detail', args=[self.user.pk]))
+        self.assertEqual(response.data['profile_pic'], 'http://testserver/api/users/avatars/256/Ada%20Lovelace.svg')
+
+    def test_avatar_is_deterministic_and_immutable(self):
+        self.client.force_authenticate(None)
+        url = reverse('users:avatar', kwargs={'size': 64, 'name': 'Ada Lovelace', 'fmt': 'svg'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn(b'>AL</text>', response.content)
+
+        avatars.get_avatar.cache_clear()
+        self.assertEqual(self.client.get(url).content, response.content)
+
+    def test_avatars_are_not_stored(self):
+        url = reverse('users:avatar', kwargs={'size': 64, 'name': 'Made Up', 'fmt': 'png'})
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(os.listdir(settings.MEDIA_ROOT), [])
+
+    def test_png_avatar(self):
+        url = reverse('users:avatar', kwargs={'size': 64, 'name': 'Ada Lovelace', 'fmt': 'png'})
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+
+    def test_invalid_avatar_requests(self):
+        for size, fmt in [(64, 'gif'), (4, 'svg'), (4096, 'svg')]:
+            url = reverse('users:avatar', kwargs={'size': size, 'name': 'Ada', 'fmt': fmt})
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_names_are_escaped(self):
+        self.assertIn(b'>&lt;X<', avatars.render_svg('<script> x', 64))
+
+
+class RosterTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        president = Role.objects.create(name='President', rank=0)
+        coordinator = Role.objects.create(name='Coordinator', rank=10)
+        member = Role.objects.create(name='Member')
+        web = Domain.objects.create(name='Web Development')
+        ml = Domain.objects.create(name='Machine Learning')
+        for username, name, role, domain in [
+            ('zed', 'Zed', member, web),
+            ('amy', 'Amy', member, ml),
+            ('bob', 'Bob', member, web),
+            ('cat', 'Cat', coordinator, web),
+            ('pat', 'Pat', president, None),
+            ('new', 'New', None, None),
+        ]:
+            User.objects.create_user(
+                username=username, email=f'{username}@example.com', name=name, role=role, domain=domain,
+                github_link=f'https://github.com/{username}',
+            )
+        User.objects.create_user(
+            username='old', email='old@example.com', name='Old', role=member, domain=web, is_active=False,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('users:roster')
+
+    def test_grouped_by_seniority(self):
+        with self.assertNumQueries(1):
+            roster = self.client.get(self.url).json()
+        self.assertEqual(
+            [(role['name'], [(domain['name'], [m['name'] for m in domain['members']]) for domain in role['domains']])
+             for role in roster['roles']],
+            [
+                ('President', [(None, ['Pat'])]),
+                ('Coordinator', [('Web Development', ['Cat'])]),
+                ('Member', [('Machine Learning', ['Amy']), ('Web Development', ['Bob', 'Zed'])]),
+                (None, [(None, ['New'])]),
+            ],
+        )
+        member = roster['roles'][0]['domains'][0]['members'][0]
+        self.assertEqual(set(member), {'id', 'name', 'batch', 'skills', 'picture'})
+        self.assertTrue(member['picture'].startswith('http://testserver/api/users/avatars/'))
+
+    def test_cached_per_host(self):
+        self.client.get(self.url, HTTP_HOST='localhost')
+        member = self.client.get(self.url, HTTP_HOST='127.0.0.1').json()['roles'][0]['domains'][0]['members'][0]
+        self.assertTrue(member['picture'].startswith('http://127.0.0.1/'), member['picture'])
+
+    def test_cached_until_a_change(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        Role.objects.filter(name='Member').update(rank=5)
+        Role.objects.get(name='Member').save()
+        roles = self.client.get(self.url).json()['roles']
+        self.assertEqual([role['name'] for role in roles], ['President', 'Member', 'Coordinator', None])
+
+    def test_picture_variant(self):
+        User.objects.filter(username='pat').update(
+            profile_pic='profile_pics/pat.jpg',
+            profile_pic_variants={'webp': {'160': 'variants/a.webp', '320': 'variants/b.webp', '640': 'variants/c.webp'}},
+        )
+        member = self.client.get(self.url).json()['roles'][0]['domains'][0]['members'][0]
+        self.assertEqual(member['picture'], 'http://testserver/media/variants/b.webp')
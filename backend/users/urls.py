@@ -1,13 +1,16 @@
 # users/urls.py
 from django.urls import path
+from core.asyncviews import read_view
 # Import all the necessary views and modules
 from . import views
 from .views import (
     RegisterView,
     UserListView,
     UserDetailView,
+    UserFacetView,
     DomainListView,
     RoleListView,
+    RosterView,
     MyTokenObtainPairView
 )
 from rest_framework_simplejwt.views import TokenRefreshView
@@ -17,12 +20,15 @@ app_name = 'users'
 urlpatterns = [
     # General user management endpoints
     path('register/', RegisterView.as_view(), name='register'),
-    path('list/', UserListView.as_view(), name='user-list'),
-    path('<int:pk>/', UserDetailView.as_view(), name='user-detail'),
+    path('list/', read_view(UserListView), name='user-list'),
+    path('<int:pk>/', read_view(UserDetailView), name='user-detail'),
+    path('facets/', UserFacetView.as_view(), name='user-facets'),
+    path('roster/', RosterView.as_view(), name='roster'),
+    path('avatars/<int:size>/<str:name>.<str:fmt>', views.avatar_view, name='avatar'),
     
     # Endpoints for related models
-    path('domains/', DomainListView.as_view(), name='domain-list'),
-    path('roles/', RoleListView.as_view(), name='role-list'),
+    path('domains/', read_view(DomainListView), name='domain-list'),
+    path('roles/', read_view(RoleListView), name='role-list'),
 
     # --- CORRECTED JWT AUTHENTICATION ENDPOINTS ---
     # Use your custom view for the primary token endpoint to include user data
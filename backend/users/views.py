@@ -5,9 +5,24 @@ from rest_framework.authtoken.models import Token
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from django.contrib.auth import login, logout
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
+from django.conf import settings
+from rest_framework.views import APIView
+from . import avatars
 from .models import User, Domain, Role
+from .roster import get_roster
 from .serializers import UserSerializer, LoginSerializer, DomainSerializer, RoleSerializer, MyTokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
+from core.asyncviews import AsyncReadMixin
+from core.cache import CachedListMixin
+from core.compiled import CompiledListMixin
+from core.conditional import ConditionalGetMixin
+from core.public import PublicReadPermission, public_cache_control
+from core.sideload import SideloadViewMixin
+from core.sparse import SparseFieldsViewMixin
+from core.views import JSONListFacetView
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -22,25 +37,53 @@ class MyTokenObtainPairView(TokenObtainPairView):
     serializer_class = MyTokenObtainPairSerializer
 
 
-class UserListView(generics.ListAPIView):
-    queryset = User.objects.select_related('role', 'domain').all()
+class UserListView(SparseFieldsViewMixin, ConditionalGetMixin, SideloadViewMixin, CompiledListMixin,
+                   AsyncReadMixin, generics.ListAPIView):
+    queryset = User.objects.select_related('role', 'domain').order_by('name', 'id')
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    response_models = [User, Role, Domain]
+    read_from_replica = True
+    json_list_filters = {'skills': 'skills'}
 
-class UserDetailView(generics.RetrieveUpdateAPIView):
+class UserFacetView(JSONListFacetView):
     queryset = User.objects.all()
+    permission_classes = [permissions.IsAuthenticated]
+    json_list_filters = {'skills': 'skills'}
+    facet_field = 'skills'
+
+class UserDetailView(SparseFieldsViewMixin, ConditionalGetMixin, AsyncReadMixin, generics.RetrieveUpdateAPIView):
+    queryset = User.objects.select_related('role', 'domain').all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    response_models = [User, Role, Domain]
+    read_from_replica = True
 
-class DomainListView(generics.ListAPIView):
+class DomainListView(ConditionalGetMixin, CachedListMixin, CompiledListMixin, AsyncReadMixin, generics.ListAPIView):
     queryset = Domain.objects.all()
     serializer_class = DomainSerializer
     permission_classes = [permissions.IsAuthenticated]
+    response_models = [Domain]
+    read_from_replica = True
 
-class RoleListView(generics.ListAPIView):
+class RoleListView(ConditionalGetMixin, CachedListMixin, CompiledListMixin, AsyncReadMixin, generics.ListAPIView):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
     permission_classes = [permissions.IsAuthenticated]
+    response_models = [Role]
+    read_from_replica = True
+
+class RosterView(APIView):
+    """Active members grouped by role and domain, for the team page (users.roster)."""
+    permission_classes = [PublicReadPermission]
+
+    def get(self, request, *args, **kwargs):
+        response = Response(get_roster(request))
+        if settings.PUBLIC_READ_ENABLED:
+            patch_cache_control(response, **public_cache_control())
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -50,3 +93,16 @@ def logout_view(request):
         return Response({'message': 'Successfully logged out'})
     except:
         return Response({'error': 'Error logging out'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@require_safe
+def avatar_view(request, size, name, fmt):
+    """
+    Initials avatar for `name`. The URL fully determines the image, so it is
+    served as immutable and browsers never ask for it again.
+    """
+    if fmt not in avatars.CONTENT_TYPES or not avatars.MIN_SIZE <= size <= avatars.MAX_SIZE:
+        raise Http404
+    response = HttpResponse(avatars.get_avatar(name, size, fmt), content_type=avatars.CONTENT_TYPES[fmt])
+    patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365, immutable=True)
+    return response
@@ -13,6 +13,7 @@ interface Project {
   github: string | null;
   demo: string | null;
   image: string;
+  imageSrcset: { webp: string; jpeg: string } | null; // 'image_srcset' from backend
   team: string[]; // Derived from 'team_members_data'
 }
 
@@ -48,6 +49,7 @@ const Projects = () => {
           github: p.github_link,
           demo: p.deployment_link,
           image: p.image || "https://images.unsplash.com/photo-1517694712202-14dd9538aa97?w=500&h=300&fit=crop",
+          imageSrcset: p.image_srcset,
           // Map team members to just their names
           team: p.team_members_data.map((member: any) => member.user.first_name || "User"),
           // The fields below do not exist in your serializer, so they are removed.
@@ -186,11 +188,19 @@ const Projects = () => {
                 <div className="bg-gray-900/50 backdrop-blur-md rounded-2xl overflow-hidden border border-gray-700/50 hover:border-blue-500/50 transition-all duration-300 h-full">
                   {/* Project Image */}
                   <div className="relative overflow-hidden h-48">
-                    <img
-                      src={project.image}
-                      alt={project.title}
-                      className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-300"
-                    />
+                    <picture className="block w-full h-full">
+                      {project.imageSrcset && (
+                        <source type="image/webp" srcSet={project.imageSrcset.webp} sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw" />
+                      )}
+                      <img
+                        src={project.image}
+                        srcSet={project.imageSrcset?.jpeg}
+                        sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
+                        alt={project.title}
+                        loading="lazy"
+                        className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-300"
+                      />
+                    </picture>
                     <div className="absolute top-4 left-4 flex gap-2">
                       {/* Access statusColors using project.status (now correctly typed) */}
                       <span className={`px-3 py-1 rounded-full text-xs font-semibold text-white ${statusColors[project.status]}`}>
@@ -288,11 +298,18 @@ const Projects = () => {
 
               {/* Project Header */}
               <div className="relative h-64 overflow-hidden rounded-t-2xl">
-                <img
-                  src={selectedProject.image} 
-                  alt={selectedProject.title} 
-                  className="w-full h-full object-cover"
-                />
+                <picture className="block w-full h-full">
+                  {selectedProject.imageSrcset && (
+                    <source type="image/webp" srcSet={selectedProject.imageSrcset.webp} sizes="(min-width: 896px) 896px, 100vw" />
+                  )}
+                  <img
+                    src={selectedProject.image}
+                    srcSet={selectedProject.imageSrcset?.jpeg}
+                    sizes="(min-width: 896px) 896px, 100vw"
+                    alt={selectedProject.title}
+                    className="w-full h-full object-cover"
+                  />
+                </picture>
                 <div className="absolute inset-0 bg-gradient-to-t from-black/60 to-transparent" />
                 <div className="absolute bottom-4 left-6">
                   <div className="flex gap-2 mb-2">
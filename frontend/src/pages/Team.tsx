@@ -25,31 +25,28 @@ const Team = () => {
     const fetchTeamMembers = async () => {
       try {
         setIsLoading(true);
-        const response = await apiService.getUsers();
+        // The whole team in one response, grouped by role (most senior
+        // first) and then by domain.
+        const response = await apiService.getRoster();
 
-        // The backend uses pagination, so the user data is in response.data.results
-        const rawUsers = response.data.results || [];
-
-        // Transform the backend data to match the frontend's TeamMember interface
-        const transformedMembers: TeamMember[] = rawUsers.map((user: any) => {
-          const backendUrl = "http://127.0.0.1:8000";
-          return {
-            id: user.id,
-            name: user.name,
-            role: user.role_name || "Member", // from role_name
-            department: user.domain_name || "General", // from domain_name
-            year: user.batch || "N/A", // from batch
-            skills: user.skills || [],
-            image: user.profile_pic
-              ? `${backendUrl}${user.profile_pic}`
-              : `https://ui-avatars.com/api/?name=${user.name.replace(
-                  " ",
-                  "+"
-                )}&background=random`,
-            // Your User model doesn't have a 'bio' field, so we add a placeholder.
-            bio: "This member has not yet added a bio. They are a valued part of our team, contributing with their unique skills and perspective.",
-          };
-        });
+        // Flatten the groups into the frontend's TeamMember interface
+        const transformedMembers: TeamMember[] = response.data.roles.flatMap((role: any) =>
+          role.domains.flatMap((domain: any) =>
+            domain.members.map((user: any) => ({
+              id: user.id,
+              name: user.name,
+              role: role.name || "Member",
+              department: domain.name || "General",
+              year: user.batch || "N/A",
+              skills: user.skills || [],
+              // Absolute URL from the API: a resized variant of the uploaded
+              // picture, or a generated initials avatar when there is none.
+              image: user.picture,
+              // Your User model doesn't have a 'bio' field, so we add a placeholder.
+              bio: "This member has not yet added a bio. They are a valued part of our team, contributing with their unique skills and perspective.",
+            }))
+          )
+        );
 
         setTeamMembers(transformedMembers);
       } catch (err) {
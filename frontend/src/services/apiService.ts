@@ -43,5 +43,14 @@ export const apiService = {
   getUsers: () => {
     return apiClient.get('/users/list/');
   },
+  // Active members grouped by role and domain, most senior first
+  getRoster: () => {
+    return apiClient.get('/users/roster/');
+  },
+
+  // Aggregate counts for the dashboard and landing pages
+  getStats: () => {
+    return apiClient.get('/stats/');
+  },
   
 };
\ No newline at end of file